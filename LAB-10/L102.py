@@ -1,4 +1,6 @@
 import heapq
+from array import array
+from collections import deque
 import time
 import matplotlib.pyplot as plt
 import numpy as np
@@ -52,21 +54,32 @@ def astar(grid, start, goal, heuristic=manhattan_distance, allow_diagonal=False)
                     heapq.heappush(open_set, (f_score[neighbor_node], neighbor_node))
     return None
 def bfs(grid, start, goal):
-    queue = [(start[0], start[1], [])]
-    visited = set()
-    visited.add(start)
-    moves = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+    # Flat open-cell mask with a wall border (cell = (x + 1) * width + (y + 1)) and an int32
+    # predecessor array: no per-entry path copies, the path is rebuilt once at the goal
+    width = len(grid[0]) + 2
+    cells = bytearray(np.pad(np.asarray(grid) == 0, 1).astype(np.uint8).tobytes())
+    source = (start[0] + 1) * width + start[1] + 1
+    target = (goal[0] + 1) * width + goal[1] + 1
+    parent = array('i', [-1]) * len(cells)
+    visited = bytearray(len(cells))
+    parent[source] = source
+    visited[source] = 1
+    queue = deque([source])
     while queue:
-        x, y, path = queue.pop(0)
-        if (x, y) == goal:
-            return path + [(x, y)]
-        for dx, dy in moves:
-            neighbor_x = x + dx
-            neighbor_y = y + dy
-            if (0 <= neighbor_x < len(grid) and 0 <= neighbor_y < len(grid[0]) and
-                    grid[neighbor_x][neighbor_y] == 0 and (neighbor_x, neighbor_y) not in visited):
-                visited.add((neighbor_x, neighbor_y))
-                queue.append((neighbor_x, neighbor_y, path + [(x, y)]))
+        cell = queue.popleft()
+        if cell == target:
+            path = []
+            while True:
+                x, y = divmod(cell, width)
+                path.append((x - 1, y - 1))
+                if parent[cell] == cell:
+                    return path[::-1]
+                cell = parent[cell]
+        for neighbor in (cell + 1, cell - 1, cell + width, cell - width):
+            if cells[neighbor] and not visited[neighbor]:
+                visited[neighbor] = 1
+                parent[neighbor] = cell
+                queue.append(neighbor)
     return None
 def uniform_cost_search(grid, start, goal):
     open_set = []
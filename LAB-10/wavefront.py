@@ -0,0 +1,140 @@
+import sys
+import time
+import numpy as np
+from L102 import bfs
+
+# Same move order as L102
+MOVES = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+
+
+# BFS distance field computed one wavefront per NumPy step
+class DistanceField:
+    """
+    Parameters:
+    - grid: 2D list or array
+    - start: (row, col) start cell
+    - free: value of walkable cells (0 for the L101/L102 grids, 1 for the L71 mazes)
+
+    The grid is padded with a wall border and flattened, so the four neighbors of a cell are
+    cell -+ width and cell -+ 1 and need no bounds checks. Each step shifts the whole frontier
+    by those four offsets at once, keeps the open cells not reached yet and labels them with
+    the next distance. Shifting only the frontier's indices instead of the full grid mask keeps
+    a step proportional to the wavefront, so the whole field costs O(cells).
+
+    field.dist is the (rows, cols) distance array, -1 for walls and unreachable cells; paths to
+    any goal are read off it by gradient descent with path(goal) or paths(goals).
+    """
+
+    def __init__(self, grid, start, free=0):
+        open_cells = np.asarray(grid) == free
+        self.shape = open_cells.shape
+        self.width = self.shape[1] + 2
+        self.start = tuple(start)
+        cells = np.pad(open_cells, 1).ravel()
+        distances = np.full(cells.size, -1, dtype=np.int32)
+        # slot[cell]: position of the cell in this step's candidates, to drop duplicates without sorting
+        slot = np.empty(cells.size, dtype=np.int32)
+        offsets = np.array([dx * self.width + dy for dx, dy in MOVES])
+        source = self.cell_of(start)
+        distances[source] = 0
+        frontier = np.array([source])
+        self.levels = 0
+        while len(frontier):
+            candidates = (frontier[:, None] + offsets).ravel()
+            candidates = candidates[cells[candidates] & (distances[candidates] < 0)]
+            if not len(candidates):
+                break
+            index = np.arange(len(candidates), dtype=np.int32)
+            slot[candidates] = index
+            frontier = candidates[slot[candidates] == index]
+            self.levels += 1
+            distances[frontier] = self.levels
+        self.distances = distances
+        # Plain-int view for the descent loop, as CSRGraph does with its arrays (LAB-5/csr_graph.py)
+        self.distances_view = memoryview(distances)
+        self.dist = distances.reshape(self.shape[0] + 2, self.width)[1:-1, 1:-1]
+
+    def cell_of(self, position):
+        return (position[0] + 1) * self.width + position[1] + 1
+
+    def distance(self, goal):
+        """Number of moves from start to goal, or None if goal cannot be reached."""
+        value = self.distances_view[self.cell_of(goal)]
+        return None if value < 0 else value
+
+    def path(self, goal):
+        """
+        Shortest path from start to goal as a list of (row, col), or None if unreachable.
+        Walks down the field from goal, always to a neighbor exactly one move closer.
+        """
+        distances = self.distances_view
+        cell = self.cell_of(goal)
+        if distances[cell] < 0:
+            return None
+        offsets = [dx * self.width + dy for dx, dy in MOVES]
+        path = [cell]
+        while distances[cell]:
+            lower = distances[cell] - 1
+            for offset in offsets:
+                if distances[cell + offset] == lower:
+                    cell += offset
+                    break
+            path.append(cell)
+        return [(cell // self.width - 1, cell % self.width - 1) for cell in reversed(path)]
+
+    def paths(self, goals):
+        """
+        path(goal) for many goals at once: all of them descend the field together, one NumPy
+        step per move, so the Python overhead is per step rather than per cell.
+        """
+        cells = np.array([self.cell_of(goal) for goal in goals], dtype=np.int64).reshape(-1)
+        remaining = self.distances[cells].astype(np.int64)
+        trail = [cells]
+        offsets = [dx * self.width + dy for dx, dy in MOVES]
+        moving = np.flatnonzero(remaining > 0)
+        while len(moving):
+            current = trail[-1].copy()
+            lower = self.distances[current[moving]] - 1
+            done = np.zeros(len(moving), dtype=bool)
+            for offset in offsets:
+                step = ~done & (self.distances[current[moving] + offset] == lower)
+                current[moving[step]] += offset
+                done |= step
+            trail.append(current)
+            moving = moving[remaining[moving] > len(trail) - 1]
+        trail = np.array(trail)
+        rows, cols = np.divmod(trail, self.width)
+        rows, cols = (rows - 1).T.tolist(), (cols - 1).T.tolist()
+        return [None if length < 0 else list(zip(rows[i][length::-1], cols[i][length::-1]))
+                for i, length in enumerate(remaining.tolist())]
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rng = np.random.default_rng(42)
+    grid = (rng.random((size, size)) < 0.2).astype(int)
+    start, goal = (0, 0), (size - 1, size - 1)
+    grid[start] = grid[goal] = 0
+    print("Grid {} x {}, 20% obstacles".format(size, size))
+
+    start_time = time.perf_counter()
+    path_bfs = bfs(grid, start, goal)
+    print("L102 bfs, one goal:           {:7.3f} s".format(time.perf_counter() - start_time))
+    start_time = time.perf_counter()
+    field = DistanceField(grid, start)
+    path = field.path(goal)
+    print("Distance field + path:        {:7.3f} s ({} wavefronts)".format(time.perf_counter() - start_time, field.levels))
+    assert len(path) == len(path_bfs)
+
+    goals = [tuple(cell) for cell in np.argwhere(field.dist >= 0)[rng.integers(0, int((field.dist >= 0).sum()), 1000)]]
+    start_time = time.perf_counter()
+    paths = [field.path(cell) for cell in goals]
+    print("1000 more goals, path():      {:7.3f} s".format(time.perf_counter() - start_time))
+    start_time = time.perf_counter()
+    assert [len(batch) for batch in field.paths(goals)] == [len(path) for path in paths]
+    print("1000 more goals, paths():     {:7.3f} s".format(time.perf_counter() - start_time))
+    print("Path length to {}: {}".format(goal, len(path) - 1))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+import sys
+from graph_io import load_graph
 def bfs(graph, start_node, end_node):
     solution = []
     costs = 0
@@ -17,18 +19,25 @@ def bfs(graph, start_node, end_node):
                 visited.append(neighbour)
         costs += 1
     return solution, costs
-print("Enter the graph (node -> neighbors). Type 'done' when finished:")
-state_space = {}
-while True:
-    line = input()
-    if line.lower() == "done":
-        break
-    parts = line.split()
-    node = parts[0]
-    neighbors = parts[1:] if len(parts) > 1 else []
-    state_space[node] = neighbors
-start_state = input("Enter the start node: ")
-goal_state = input("Enter the end node: ")
+if len(sys.argv) > 1:
+    # python L51.py graph_file|- [start end]: bulk load instead of typing the graph line by line
+    state_space = load_graph(sys.argv[1])
+else:
+    print("Enter the graph (node -> neighbors). Type 'done' when finished:")
+    state_space = {}
+    while True:
+        line = input()
+        if line.lower() == "done":
+            break
+        parts = line.split()
+        node = parts[0]
+        neighbors = parts[1:] if len(parts) > 1 else []
+        state_space[node] = neighbors
+if len(sys.argv) > 3:
+    start_state, goal_state = sys.argv[2], sys.argv[3]
+else:
+    start_state = input("Enter the start node: ")
+    goal_state = input("Enter the end node: ")
 solution, costs = bfs(state_space, start_state, goal_state)
 print("Solution: {}".format(solution))
 print("Costs: {}".format(costs))
\ No newline at end of file
@@ -1,6 +1,14 @@
+import sys
 from collections import deque
+from csr_graph import CSRGraph
+from graph_io import load_graph
 # BFS Implementation
-def bfs(graph, start_node, end_node):
+def bfs(graph, start_node, end_node, reachability=None):
+    # With a ReachabilityIndex (see reachability.py) hopeless queries stop before the search
+    if reachability is not None and not reachability.may_reach(start_node, end_node):
+        return []
+    if isinstance(graph, CSRGraph):
+        return bfs_csr(graph, start_node, end_node)
     solution = []
     frontier = deque([start_node])
     visited = set([start_node])
@@ -20,7 +28,11 @@ def bfs(graph, start_node, end_node):
     return []
 
 # DFS Implementation
-def dfs(graph, start_node, end_node):
+def dfs(graph, start_node, end_node, reachability=None):
+    if reachability is not None and not reachability.may_reach(start_node, end_node):
+        return []
+    if isinstance(graph, CSRGraph):
+        return dfs_csr(graph, start_node, end_node)
     solution = []
     stack = [start_node]
     visited = set()
@@ -42,105 +54,211 @@ def dfs(graph, start_node, end_node):
     return []
 
 # Bidirectional BFS Implementation
-def bidirectional_bfs(graph, start_node, end_node):
+# Level-synchronous: each step expands one whole level of the side whose frontier has fewer
+# edges to scan, and the two halves are joined through the parent maps.
+# The back side follows edges backwards; pass reverse (see reverse_graph) when running many queries.
+def bidirectional_bfs(graph, start_node, end_node, reverse=None, stats=None):
+    counts = stats if stats is not None else {}
+    counts.update(front_expanded=0, back_expanded=0, edges_scanned=0)
     if start_node == end_node:
         return [start_node]
+    neighbors, back_neighbors, degree, start, end, to_labels = bidirectional_view(graph, reverse, start_node, end_node)
+    if start is None or end is None:
+        return []
+
+    frontiers = [[start], [end]]
+    parents = [{start: None}, {end: None}]
+    expansions = [neighbors, back_neighbors]
+    meeting_point = None
+    side = 1
+
+    while frontiers[0] and frontiers[1] and meeting_point is None:
+        front_work = sum(degree(node, 0) for node in frontiers[0])
+        back_work = sum(degree(node, 1) for node in frontiers[1])
+        # Cheaper side first; on a tie take turns
+        side = 0 if front_work < back_work else 1 if back_work < front_work else 1 - side
+        visited, other_visited, expand = parents[side], parents[1 - side], expansions[side]
+        next_frontier = []
+        expanded = scanned = 0
+        for current in frontiers[side]:
+            expanded += 1
+            for neighbor in expand(current):
+                scanned += 1
+                if neighbor not in visited:
+                    visited[neighbor] = current
+                    next_frontier.append(neighbor)
+                    if neighbor in other_visited:
+                        meeting_point = neighbor
+                        break
+            if meeting_point is not None:
+                break
+        frontiers[side] = next_frontier
+        counts['front_expanded' if side == 0 else 'back_expanded'] += expanded
+        counts['edges_scanned'] += scanned
+
+    if meeting_point is None:
+        return []
+    return to_labels(construct_path(parents[0], parents[1], meeting_point))
+
+# BFS/DFS on a CSRGraph: same results as above, but over integer ids
+def bfs_csr(graph, start_node, end_node):
+    start, end = graph.id_of(start_node), graph.id_of(end_node)
+    if start is None:
+        return [start_node] if start_node == end_node else []
+    solution = []
+    frontier = deque([start])
+    visited = bytearray(graph.num_nodes)
+    visited[start] = 1
+
+    while frontier:
+        selected_node = frontier.popleft()
+        solution.append(selected_node)
+
+        if selected_node == end:
+            return graph.path_labels(solution)
+
+        for neighbor in graph.neighbors(selected_node):
+            if not visited[neighbor]:
+                visited[neighbor] = 1
+                frontier.append(neighbor)
+
+    return []
+
+def dfs_csr(graph, start_node, end_node):
+    start, end = graph.id_of(start_node), graph.id_of(end_node)
+    if start is None:
+        return [start_node] if start_node == end_node else []
+    solution = []
+    stack = [start]
+    visited = bytearray(graph.num_nodes)
+
+    while stack:
+        selected_node = stack.pop()
+        if visited[selected_node]:
+            continue
+        visited[selected_node] = 1
+        solution.append(selected_node)
+
+        if selected_node == end:
+            return graph.path_labels(solution)
 
-    front_frontier = deque([start_node])
-    back_frontier = deque([end_node])
-    front_visited = {start_node: None}
-    back_visited = {end_node: None}
-
-    while front_frontier and back_frontier:
-        # Expand front frontier
-        if front_frontier:
-            current = front_frontier.popleft()
-            for neighbor in graph.get(current, []):
-                if neighbor not in front_visited:
-                    front_visited[neighbor] = current
-                    front_frontier.append(neighbor)
-                    if neighbor in back_visited:
-                        return construct_path(front_visited, back_visited, neighbor)
-
-        # Expand back frontier
-        if back_frontier:
-            current = back_frontier.popleft()
-            for neighbor in graph.get(current, []):
-                if neighbor not in back_visited:
-                    back_visited[neighbor] = current
-                    back_frontier.append(neighbor)
-                    if neighbor in front_visited:
-                        return construct_path(front_visited, back_visited, neighbor)
+        for neighbor in reversed(graph.neighbors(selected_node)):
+            if not visited[neighbor]:
+                stack.append(neighbor)
 
     return []
 
 # Bidirectional DFS Implementation
-def bidirectional_dfs(graph, start_node, end_node):
-    def dfs_partial(node, visited, opposite_visited, stack, path):
-        while stack:
-            current = stack.pop()
-            if current in visited:
-                continue
-            visited[current] = path[:]
-            path.append(current)
-
-            if current in opposite_visited:
-                return path + opposite_visited[current][::-1]
-
-            for neighbor in reversed(graph.get(current, [])):
-                if neighbor not in visited:
-                    stack.append(neighbor)
+# Both sides keep parent pointers instead of path copies; the side with the smaller stack moves next.
+def bidirectional_dfs(graph, start_node, end_node, reverse=None, stats=None):
+    counts = stats if stats is not None else {}
+    counts.update(front_expanded=0, back_expanded=0, edges_scanned=0)
+    if start_node == end_node:
+        return [start_node]
+    neighbors, back_neighbors, _, start, end, to_labels = bidirectional_view(graph, reverse, start_node, end_node)
+    if start is None or end is None:
+        return []
+
+    stacks = [[(start, None)], [(end, None)]]
+    parents = [{}, {}]
+    expansions = [neighbors, back_neighbors]
+    meeting_point = None
+    side = 1
+
+    while stacks[0] or stacks[1]:
+        if not stacks[0] or not stacks[1]:
+            side = 0 if stacks[0] else 1
+        else:
+            side = 0 if len(stacks[0]) < len(stacks[1]) else 1 if len(stacks[1]) < len(stacks[0]) else 1 - side
+        current, parent = stacks[side].pop()
+        visited = parents[side]
+        if current in visited:
+            continue
+        visited[current] = parent
+        counts['front_expanded' if side == 0 else 'back_expanded'] += 1
 
-        return None
+        if current in parents[1 - side]:
+            meeting_point = current
+            break
 
-    front_stack = [start_node]
-    back_stack = [end_node]
-    front_visited = {}
-    back_visited = {}
+        for neighbor in reversed(expansions[side](current)):
+            counts['edges_scanned'] += 1
+            if neighbor not in visited:
+                stacks[side].append((neighbor, current))
 
-    while front_stack or back_stack:
-        if front_stack:
-            front_path = dfs_partial(front_stack.pop(), front_visited, back_visited, front_stack, [])
-            if front_path:
-                return front_path
+    if meeting_point is None:
+        return []
+    return to_labels(construct_path(parents[0], parents[1], meeting_point))
 
-        if back_stack:
-            back_path = dfs_partial(back_stack.pop(), back_visited, front_visited, back_stack, [])
-            if back_path:
-                return back_path
+# Reverse graph for the backward side: node -> nodes with an edge into it
+def reverse_graph(graph):
+    if isinstance(graph, CSRGraph):
+        return graph.reverse()
+    reverse = {node: [] for node in graph}
+    for node, neighbors in graph.items():
+        for neighbor in neighbors:
+            reverse.setdefault(neighbor, []).append(node)
+    return reverse
 
-    return []
+# Neighbor/degree accessors shared by the bidirectional searches, for dicts and CSRGraph alike
+def bidirectional_view(graph, reverse, start_node, end_node):
+    if reverse is None:
+        reverse = reverse_graph(graph)
+    if isinstance(graph, CSRGraph):
+        offsets = (graph.offsets_view, reverse.offsets_view)
+
+        def degree(node, side):
+            return offsets[side][node + 1] - offsets[side][node]
+
+        return (graph.neighbors, reverse.neighbors, degree,
+                graph.id_of(start_node), graph.id_of(end_node), graph.path_labels)
+
+    graphs = (graph, reverse)
+
+    def degree(node, side):
+        return len(graphs[side].get(node, []))
+
+    return (lambda node: graph.get(node, []), lambda node: reverse.get(node, []), degree,
+            start_node, end_node, lambda path: path)
 
 # Helper function to construct the path
 def construct_path(front_visited, back_visited, meeting_point):
     path = []
     current = meeting_point
 
-    while current:
+    while current is not None:
         path.append(current)
         current = front_visited[current]
     path.reverse()
 
     current = back_visited[meeting_point]
-    while current:
+    while current is not None:
         path.append(current)
         current = back_visited[current]
 
     return path
 
 # Function to get user input for graph and run the algorithms
+# Usage: python L52.py [graph_file|- [start end]]
 def main():
-    graph = {}
-    print("Enter the graph (node -> neighbors). Type 'done' when finished:")
-    while True:
-        line = input()
-        if line.lower() == 'done':
-            break
-        node, *neighbors = line.split()
-        graph[node] = neighbors
-
-    start_node = input("Enter the start node: ").strip()
-    end_node = input("Enter the end node: ").strip()
+    if len(sys.argv) > 1:
+        # Same "node neighbors..." lines, streamed from a file (snapshot cached) or stdin
+        graph = load_graph(sys.argv[1])
+    else:
+        graph = {}
+        print("Enter the graph (node -> neighbors). Type 'done' when finished:")
+        while True:
+            line = input()
+            if line.lower() == 'done':
+                break
+            node, *neighbors = line.split()
+            graph[node] = neighbors
+
+    if len(sys.argv) > 3:
+        start_node, end_node = sys.argv[2], sys.argv[3]
+    else:
+        start_node = input("Enter the start node: ").strip()
+        end_node = input("Enter the end node: ").strip()
 
     print("\n--- BFS ---")
     print("Solution:", bfs(graph, start_node, end_node))
@@ -148,11 +266,17 @@ def main():
     print("\n--- DFS ---")
     print("Solution:", dfs(graph, start_node, end_node))
 
+    reverse = reverse_graph(graph)
+    stats = {}
     print("\n--- Bidirectional BFS ---")
-    print("Solution:", bidirectional_bfs(graph, start_node, end_node))
+    print("Solution:", bidirectional_bfs(graph, start_node, end_node, reverse, stats))
+    print("Expanded (front/back):", stats['front_expanded'], "/", stats['back_expanded'],
+          "Edges scanned:", stats['edges_scanned'])
 
     print("\n--- Bidirectional DFS ---")
-    print("Solution:", bidirectional_dfs(graph, start_node, end_node))
+    print("Solution:", bidirectional_dfs(graph, start_node, end_node, reverse, stats))
+    print("Expanded (front/back):", stats['front_expanded'], "/", stats['back_expanded'],
+          "Edges scanned:", stats['edges_scanned'])
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
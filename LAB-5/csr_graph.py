@@ -0,0 +1,202 @@
+from numbers import Number
+
+import numpy as np
+
+
+def is_weighted_entry(entry, graph):
+    """True if an adjacency list entry looks like (neighbor, weight) rather than a tuple-labelled neighbor."""
+    return (isinstance(entry, tuple) and len(entry) == 2 and isinstance(entry[1], Number)
+            and not isinstance(entry[1], bool) and entry not in graph)
+
+
+# Frozen graph in Compressed Sparse Row (CSR) form
+class CSRGraph:
+    """
+    Node labels are interned to integer ids 0..n-1 once. The outgoing edges of
+    node u are targets[offsets[u]:offsets[u + 1]] (and the matching slice of
+    weights for weighted graphs).
+
+    The graph also behaves like the read-only adjacency dicts used by the labs,
+    so graph[label] and graph.get(label, []) give the neighbor list (or the
+    (neighbor, weight) list when weighted) in the original labels.
+    """
+
+    def __init__(self, labels, offsets, targets, weights=None, index=None):
+        self.labels = labels if isinstance(labels, list) else list(labels)
+        self.index = index if index is not None else {label: i for i, label in enumerate(self.labels)}
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.targets = np.asarray(targets, dtype=np.int32)
+        self.weights = None if weights is None else np.asarray(weights)
+        if len(self.offsets) != len(self.labels) + 1:
+            raise ValueError("offsets must have one entry more than there are nodes.")
+        if self.offsets[-1] != len(self.targets):
+            raise ValueError("offsets[-1] must equal the number of edges.")
+        if self.weights is not None and len(self.weights) != len(self.targets):
+            raise ValueError("weights must have one entry per edge.")
+        for array in (self.offsets, self.targets, self.weights):
+            if array is not None:
+                array.flags.writeable = False
+        # memoryviews give plain Python ints/floats, much faster than numpy scalars in loops
+        self.offsets_view = memoryview(self.offsets)
+        self.targets_view = memoryview(self.targets)
+        self.weights_view = None if self.weights is None else memoryview(self.weights)
+        self.reverse_graph = None
+
+    # Pickle only the arrays (memoryviews cannot be pickled), e.g. to hand the graph to worker processes
+    def __getstate__(self):
+        return self.labels, self.offsets, self.targets, self.weights
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    @classmethod
+    def from_adjacency(cls, graph, weighted=None):
+        """
+        Build from an adjacency dict: {node: [neighbor, ...]} (LAB-5 style)
+        or {node: [(neighbor, weight), ...]} (LAB-8 style).
+        Nodes that only appear as neighbors are interned as well.
+        weighted=None detects the style: an entry counts as a (neighbor, weight) pair only if it
+        is a 2-tuple with a numeric second element and is not itself a node, so tuple labels
+        such as grid coordinates stay plain neighbors. Pass True/False to skip the detection.
+        """
+        labels = []
+        index = {}
+
+        def intern(label):
+            node_id = index.get(label)
+            if node_id is None:
+                node_id = index[label] = len(labels)
+                labels.append(label)
+            return node_id
+
+        for node in graph:
+            intern(node)
+
+        if weighted is None:
+            weighted = any(is_weighted_entry(entry, graph)
+                           for neighbors in graph.values() for entry in neighbors[:1])
+        degrees = [0] * len(labels)
+        targets = []
+        weights = [] if weighted else None
+        for node, neighbors in graph.items():
+            degrees[index[node]] = len(neighbors)
+        offsets = np.zeros(len(labels) + 1, dtype=np.int64)
+        np.cumsum(degrees, out=offsets[1:])
+        # Fill in node-id order so that each node's edges are contiguous
+        for node_id in range(len(degrees)):
+            for entry in graph.get(labels[node_id], []):
+                if weighted:
+                    neighbor, weight = entry
+                    weights.append(weight)
+                else:
+                    neighbor = entry
+                targets.append(intern(neighbor))
+        # Nodes interned while filling targets have no outgoing edges
+        offsets = np.concatenate([offsets, np.full(len(labels) - len(degrees), offsets[-1])])
+        return cls(labels, offsets, targets, weights)
+
+    @classmethod
+    def from_edges(cls, labels, sources, targets, weights=None, index=None):
+        """Build from parallel edge arrays over node ids; a stable sort keeps each node's edges in input order."""
+        sources = np.asarray(sources)
+        order = np.argsort(sources, kind="stable")
+        offsets = np.zeros(len(labels) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=len(labels)), out=offsets[1:])
+        weights = None if weights is None else np.asarray(weights)[order]
+        return cls(labels, offsets, np.asarray(targets)[order], weights, index)
+
+    @property
+    def num_nodes(self):
+        return len(self.labels)
+
+    @property
+    def num_edges(self):
+        return len(self.targets)
+
+    @property
+    def weighted(self):
+        return self.weights is not None
+
+    def reverse(self):
+        """Graph with every edge flipped (in-neighbors become neighbors). Built once, then cached."""
+        if self.reverse_graph is None:
+            sources = np.repeat(np.arange(self.num_nodes, dtype=np.int32), np.diff(self.offsets))
+            self.reverse_graph = CSRGraph.from_edges(self.labels, self.targets, sources, self.weights, self.index)
+            self.reverse_graph.reverse_graph = self
+        return self.reverse_graph
+
+    def permuted(self, order):
+        """
+        Same graph with node ids renumbered: new id i is old id order[i]. Labels move with
+        their nodes, so labels (and path_labels) still map back to the original labels.
+        Each node keeps its neighbors in their original order.
+        """
+        order = np.asarray(order, dtype=np.int64)
+        if len(order) != self.num_nodes:
+            raise ValueError("order must list every node id exactly once.")
+        new_id = np.empty(self.num_nodes, dtype=np.int32)
+        new_id[order] = np.arange(self.num_nodes, dtype=np.int32)
+        degrees = np.diff(self.offsets)[order]
+        offsets = np.zeros(self.num_nodes + 1, dtype=np.int64)
+        np.cumsum(degrees, out=offsets[1:])
+        # Old edge positions, node by node in the new order
+        positions = (np.arange(offsets[-1], dtype=np.int64) - np.repeat(offsets[:-1], degrees)
+                     + np.repeat(self.offsets[order], degrees))
+        weights = None if self.weights is None else self.weights[positions]
+        labels = [self.labels[node_id] for node_id in order.tolist()]
+        return CSRGraph(labels, offsets, new_id[self.targets[positions]], weights)
+
+    def id_of(self, label):
+        """Integer id of a label, or None if the label is not in the graph."""
+        return self.index.get(label)
+
+    def neighbors(self, node_id):
+        """Neighbor ids of node_id as a memoryview slice (no copy)."""
+        return self.targets_view[self.offsets_view[node_id]:self.offsets_view[node_id + 1]]
+
+    def edges(self, node_id):
+        """(neighbor_id, weight) pairs of node_id; weight is 1 for unweighted graphs."""
+        lo, hi = self.offsets_view[node_id], self.offsets_view[node_id + 1]
+        if self.weights_view is None:
+            return ((neighbor, 1) for neighbor in self.targets_view[lo:hi])
+        return zip(self.targets_view[lo:hi], self.weights_view[lo:hi])
+
+    def path_labels(self, path):
+        """Map a list of node ids back to the original labels."""
+        labels = self.labels
+        return [labels[node_id] for node_id in path]
+
+    # Read-only mapping interface, so the graph can stand in for an adjacency dict
+    def __len__(self):
+        return len(self.labels)
+
+    def __iter__(self):
+        return iter(self.labels)
+
+    def __contains__(self, label):
+        return label in self.index
+
+    def __getitem__(self, label):
+        node_id = self.index[label]
+        labels = self.labels
+        if self.weights_view is None:
+            return [labels[neighbor] for neighbor in self.neighbors(node_id)]
+        return [(labels[neighbor], weight) for neighbor, weight in self.edges(node_id)]
+
+    def get(self, label, default=None):
+        if label not in self.index:
+            return default
+        return self[label]
+
+    def keys(self):
+        return iter(self.labels)
+
+    def items(self):
+        return ((label, self[label]) for label in self.labels)
+
+    def values(self):
+        return (self[label] for label in self.labels)
+
+    def __repr__(self):
+        return "CSRGraph(nodes={}, edges={}, weighted={})".format(
+            self.num_nodes, self.num_edges, self.weighted)
@@ -0,0 +1,162 @@
+import random
+import sys
+import time
+
+import numpy as np
+
+from csr_graph import CSRGraph
+from graph_io import build_csr
+from L52 import bfs
+
+
+def gather_edges(offsets, nodes):
+    """Positions in the CSR target array of every edge of nodes, plus the owning node of each position."""
+    starts = offsets[nodes]
+    counts = offsets[nodes + 1] - starts
+    owners = np.repeat(nodes, counts)
+    # position = start of the owner's slice + rank within that slice
+    positions = np.arange(counts.sum(), dtype=np.int64) - np.repeat(np.cumsum(counts) - counts, counts)
+    return positions + np.repeat(starts, counts), owners
+
+
+def top_down_step(graph, frontier, parent):
+    """Classic step: every frontier node scans its out-edges for unvisited neighbors."""
+    positions, owners = gather_edges(graph.offsets, frontier)
+    neighbors = graph.targets[positions]
+    new = parent[neighbors] == -1
+    neighbors, owners = neighbors[new], owners[new]
+    # Several frontier nodes may reach the same neighbor; any of them is a valid parent
+    parent[neighbors] = owners
+    if len(neighbors) > len(parent) // 64:
+        # Big level: dedupe through a bitmap, linear instead of sorting
+        seen = np.zeros(len(parent), dtype=bool)
+        seen[neighbors] = True
+        return np.flatnonzero(seen).astype(np.int32), len(positions)
+    return np.unique(neighbors), len(positions)
+
+
+def bottom_up_step(reverse, in_frontier, parent):
+    """
+    Every unvisited node scans its in-neighbors until it finds one in the frontier bitmap.
+    Done one in-edge position per round over all still-searching nodes, so a node
+    stops checking edges as soon as it has found its parent.
+    """
+    searching = np.flatnonzero(parent == -1).astype(np.int32)
+    starts = reverse.offsets[searching]
+    degrees = reverse.offsets[searching + 1] - starts
+    keep = degrees > 0
+    searching, starts, degrees = searching[keep], starts[keep], degrees[keep]
+    found = []
+    checked = 0
+    k = 0
+    while len(searching):
+        candidates = reverse.targets[starts + k]
+        checked += len(candidates)
+        hit = in_frontier[candidates]
+        parent[searching[hit]] = candidates[hit]
+        found.append(searching[hit])
+        k += 1
+        more = ~hit & (degrees > k)
+        searching, starts, degrees = searching[more], starts[more], degrees[more]
+    return np.concatenate(found) if found else np.zeros(0, dtype=np.int32), checked
+
+
+# Direction-optimizing BFS (Beamer et al.)
+def direction_optimizing_bfs(graph, start, alpha=14, beta=24, stats=None):
+    """
+    Parameters:
+    - graph: CSRGraph (adjacency dicts are converted)
+    - start: start label
+    - alpha: go bottom-up once the frontier's out-edges exceed 1/alpha of the unvisited nodes' in-edges
+    - beta: go back top-down once the frontier has fewer than n/beta nodes
+    - stats: optional dict, filled with 'edges_checked' and the direction of every level in 'steps'
+    Returns:
+    - parent: int32 array over node ids, parent[start] = start and -1 for unreachable nodes
+    - depth: int32 array of hop distances, -1 for unreachable nodes
+    """
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_adjacency(graph)
+    reverse = graph.reverse()
+    n = graph.num_nodes
+    source = graph.id_of(start)
+    parent = np.full(n, -1, dtype=np.int32)
+    depth = np.full(n, -1, dtype=np.int32)
+    counts = stats if stats is not None else {}
+    counts.update(edges_checked=0, steps=[])
+    if source is None:
+        return parent, depth
+    parent[source] = source
+    depth[source] = 0
+
+    out_degree = np.diff(graph.offsets)
+    in_degree = np.diff(reverse.offsets)
+    unvisited_in_edges = int(in_degree.sum()) - int(in_degree[source])
+    frontier = np.array([source], dtype=np.int32)
+    bottom_up = False
+    level = 0
+    while len(frontier):
+        frontier_out_edges = int(out_degree[frontier].sum())
+        if not bottom_up and frontier_out_edges * alpha > unvisited_in_edges:
+            bottom_up = True
+        elif bottom_up and len(frontier) < n / beta:
+            bottom_up = False
+
+        if bottom_up:
+            in_frontier = np.zeros(n, dtype=bool)
+            in_frontier[frontier] = True
+            frontier, checked = bottom_up_step(reverse, in_frontier, parent)
+        else:
+            frontier, checked = top_down_step(graph, frontier, parent)
+        level += 1
+        depth[frontier] = level
+        unvisited_in_edges -= int(in_degree[frontier].sum())
+        counts['edges_checked'] += checked
+        counts['steps'].append('bottom-up' if bottom_up else 'top-down')
+    return parent, depth
+
+
+def top_down_bfs(graph, start, stats=None):
+    """Same vectorized BFS, but top-down at every level (alpha = 0 never switches)."""
+    return direction_optimizing_bfs(graph, start, alpha=0, stats=stats)
+
+
+def parent_labels(graph, parent):
+    """Parent tree as {label: parent label} (None for the start), like the parent dict in L81's bfs."""
+    labels = graph.labels
+    return {labels[node]: (None if p == node else labels[p])
+            for node, p in enumerate(parent.tolist()) if p != -1}
+
+
+def random_graph(num_nodes, degree, seed=0):
+    """Low-diameter, undirected random graph as a CSRGraph."""
+    rng = np.random.default_rng(seed)
+    sources = rng.integers(0, num_nodes, num_nodes * degree // 2, dtype=np.int32)
+    targets = rng.integers(0, num_nodes, num_nodes * degree // 2, dtype=np.int32)
+    sources, targets = np.concatenate([sources, targets]), np.concatenate([targets, sources])
+    return build_csr([str(i) for i in range(num_nodes)], sources, targets)
+
+
+def main():
+    num_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    degree = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    graph = random_graph(num_nodes, degree)
+    start = random.Random(0).choice(graph.labels)
+    print("Graph: {} nodes, {} edges, start {}".format(graph.num_nodes, graph.num_edges, start))
+
+    start_time = time.perf_counter()
+    bfs(graph, start, None)
+    print("L52 bfs (queue, top-down):   {:7.3f} s".format(time.perf_counter() - start_time))
+
+    results = {}
+    for name, search in (("top-down", top_down_bfs), ("direction-optimizing", direction_optimizing_bfs)):
+        stats = {}
+        start_time = time.perf_counter()
+        results[name] = search(graph, start, stats=stats)
+        print("{:<28} {:7.3f} s, {:>10} edges checked, steps: {}".format(
+            name + ":", time.perf_counter() - start_time, stats['edges_checked'], ' '.join(
+                'B' if step == 'bottom-up' else 'T' for step in stats['steps'])))
+    assert np.array_equal(results["top-down"][1], results["direction-optimizing"][1])
+
+
+if __name__ == "__main__":
+    main()
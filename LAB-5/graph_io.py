@@ -0,0 +1,181 @@
+import os
+import struct
+import sys
+from array import array
+
+import numpy as np
+
+from csr_graph import CSRGraph
+
+CHUNK_SIZE = 1 << 22  # bytes read per chunk while streaming
+SNAPSHOT_MAGIC = b"CSRG"
+SNAPSHOT_VERSION = 1
+# magic, version, weight kind, nodes, edges, label bytes
+SNAPSHOT_HEADER = struct.Struct("<4sIIQQQ")
+WEIGHT_KINDS = {0: None, 1: np.int64, 2: np.float64}
+
+
+def open_source(source):
+    """A path, '-' for sys.stdin.buffer, or an already open binary file."""
+    if source == "-":
+        return sys.stdin.buffer, False
+    if isinstance(source, (str, os.PathLike)):
+        return open(source, "rb"), True
+    return source, False
+
+
+def read_lines(stream, chunk_size=CHUNK_SIZE):
+    """Yield the lines of a binary stream, reading it chunk_size bytes at a time."""
+    remainder = b""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        lines = (remainder + chunk).split(b"\n")
+        remainder = lines.pop()
+        yield from lines
+    if remainder:
+        yield remainder
+
+
+# Streaming text loader
+def load_edge_list(source, weighted=False, chunk_size=CHUNK_SIZE):
+    """
+    Parameters:
+    - source: path, '-' for stdin, or a binary file object
+    - weighted: False for lines "node neighbor1 neighbor2 ..." (a plain "u v" edge list is a special case,
+      and this is also the format typed into L51/L52), True for lines "u v weight"
+    - chunk_size: bytes read per chunk
+    Returns:
+    - CSRGraph with edges in input order. Blank lines and lines starting with '#' are skipped.
+    """
+    labels = []
+    index = {}
+    sources = array("i")
+    targets = array("i")
+    weights = array("d") if weighted else None
+    integral = True
+
+    def intern(token):
+        node_id = index.get(token)
+        if node_id is None:
+            node_id = index[token] = len(labels)
+            labels.append(token)
+        return node_id
+
+    stream, owned = open_source(source)
+    try:
+        for line_number, line in enumerate(read_lines(stream, chunk_size), 1):
+            parts = line.split()
+            if not parts or parts[0].startswith(b"#"):
+                continue
+            node = intern(parts[0])
+            if weighted:
+                if len(parts) != 3:
+                    raise ValueError("Line {}: expected 'u v weight', got {!r}".format(line_number, line))
+                sources.append(node)
+                targets.append(intern(parts[1]))
+                weight = float(parts[2])
+                integral = integral and weight.is_integer() and b"." not in parts[2]
+                weights.append(weight)
+            else:
+                for neighbor in parts[1:]:
+                    sources.append(node)
+                    targets.append(intern(neighbor))
+    finally:
+        if owned:
+            stream.close()
+
+    return build_csr([label.decode() for label in labels], sources, targets, weights,
+                     np.int64 if integral else np.float64)
+
+
+def build_csr(labels, sources, targets, weights=None, weight_dtype=np.float64):
+    """CSRGraph from parallel edge arrays; a stable sort keeps each node's edges in input order."""
+    sources = np.frombuffer(sources, dtype=np.int32) if isinstance(sources, array) else np.asarray(sources)
+    targets = np.frombuffer(targets, dtype=np.int32) if isinstance(targets, array) else np.asarray(targets)
+    if weights is not None:
+        weights = np.asarray(weights, dtype=np.float64).astype(weight_dtype)
+    return CSRGraph.from_edges(labels, sources, targets, weights)
+
+
+# Binary snapshot: header, offsets, targets, weights, then newline separated labels
+def align(position):
+    return (position + 7) & ~7
+
+
+def save_snapshot(graph, path):
+    """Write graph to path so load_snapshot can memory-map it back. Labels are stored as str."""
+    label_bytes = "\n".join(str(label) for label in graph.labels).encode()
+    weight_kind = 0
+    if graph.weights is not None:
+        weight_kind = 2 if np.issubdtype(graph.weights.dtype, np.floating) else 1
+    header = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, weight_kind,
+                                  graph.num_nodes, graph.num_edges, len(label_bytes))
+    arrays = [graph.offsets.astype(np.int64, copy=False), graph.targets.astype(np.int32, copy=False)]
+    if weight_kind:
+        arrays.append(graph.weights.astype(WEIGHT_KINDS[weight_kind], copy=False))
+    with open(path, "wb") as f:
+        f.write(header)
+        for data in arrays:
+            f.write(b"\0" * (align(f.tell()) - f.tell()))
+            f.write(np.ascontiguousarray(data).tobytes())
+        f.write(label_bytes)
+
+
+def load_snapshot(path):
+    """Open a snapshot written by save_snapshot. The edge arrays are read-only numpy.memmap views."""
+    with open(path, "rb") as f:
+        magic, version, weight_kind, num_nodes, num_edges, label_size = SNAPSHOT_HEADER.unpack(
+            f.read(SNAPSHOT_HEADER.size))
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+        raise ValueError("{} is not a graph snapshot (version {})".format(path, SNAPSHOT_VERSION))
+
+    position = SNAPSHOT_HEADER.size
+    sections = []
+    for dtype, length in ((np.int64, num_nodes + 1), (np.int32, num_edges), (WEIGHT_KINDS[weight_kind], num_edges)):
+        if dtype is None:
+            sections.append(None)
+            continue
+        position = align(position)
+        # np.memmap cannot map zero bytes
+        sections.append(np.memmap(path, dtype=dtype, mode="r", offset=position, shape=(length,))
+                        if length else np.zeros(0, dtype=dtype))
+        position += length * np.dtype(dtype).itemsize
+    offsets, targets, weights = sections
+
+    with open(path, "rb") as f:
+        f.seek(position)
+        label_bytes = f.read(label_size)
+    labels = label_bytes.decode().split("\n") if num_nodes else []
+    return CSRGraph(labels, offsets, targets, weights)
+
+
+def snapshot_is_weighted(path):
+    """Whether the snapshot at path stores edge weights (reads the header only)."""
+    with open(path, "rb") as f:
+        header = f.read(SNAPSHOT_HEADER.size)
+    if len(header) < SNAPSHOT_HEADER.size:
+        return None
+    magic, version, weight_kind = SNAPSHOT_HEADER.unpack(header)[:3]
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+        return None
+    return weight_kind != 0
+
+
+def load_graph(path, weighted=False, snapshot_path=None):
+    """
+    Load a text graph, caching it as a binary snapshot next to it (path + '.csr', or
+    path + '.weighted.csr' for weighted loads, so L52 and L81 can share one text file).
+    Later runs open the snapshot instead of parsing again, unless the text file is newer
+    or the snapshot was written for the other weighted setting.
+    """
+    if path == "-":
+        return load_edge_list(path, weighted)
+    snapshot_path = snapshot_path or path + (".weighted.csr" if weighted else ".csr")
+    if (os.path.exists(snapshot_path) and os.path.getmtime(snapshot_path) >= os.path.getmtime(path)
+            and snapshot_is_weighted(snapshot_path) == bool(weighted)):
+        return load_snapshot(snapshot_path)
+    graph = load_edge_list(path, weighted)
+    save_snapshot(graph, snapshot_path)
+    return graph
@@ -0,0 +1,187 @@
+import random
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+from csr_graph import CSRGraph
+from direction_optimizing_bfs import gather_edges, random_graph
+
+# Seeds handled together: 1024 seeds = 16 uint64 words per node
+BLOCK_SIZE = 1024
+# Per-edge seed bits gathered at once while advancing a level, so memory stays bounded on big graphs
+CHUNK_BYTES = 1 << 24
+
+
+def reduce_or(table, index, starts):
+    """
+    OR of the rows table[index[starts[g]:starts[g + 1]]] for every group g (the last group runs to
+    the end of index). Groups are processed in chunks of about CHUNK_BYTES of gathered rows instead
+    of building the whole len(index) x words array at once.
+    """
+    ends = np.append(starts[1:], len(index))
+    chunk_edges = max(1, CHUNK_BYTES // table[:1].nbytes)
+    result = np.empty((len(starts), table.shape[1]), dtype=table.dtype)
+    group = 0
+    while group < len(starts):
+        lo = starts[group]
+        # At least one group per chunk, even if it alone has more than chunk_edges edges
+        last = max(group + 1, int(np.searchsorted(ends, lo + chunk_edges, side='right')))
+        result[group:last] = np.bitwise_or.reduceat(table[index[lo:ends[last - 1]]], starts[group:last] - lo, axis=0)
+        group = last
+    return result
+
+
+def advance(graph, reverse, rows, bits):
+    """
+    One level for every seed at once: reached[v] = OR of frontier[u] over all edges u -> v,
+    a boolean sparse matrix-vector product where each "value" is a row of seed bits.
+    The frontier is given sparsely (node ids rows, their bit rows bits) and so is the result.
+    Pull over the in-edges of every node when the frontier is large, otherwise push along the
+    out-edges of the frontier only.
+    """
+    out_edges = int((graph.offsets[rows + 1] - graph.offsets[rows]).sum())
+    if not out_edges:
+        return rows[:0], bits[:0]
+    if out_edges * 4 >= graph.num_edges:
+        frontier = np.zeros((graph.num_nodes, bits.shape[1]), dtype=bits.dtype)
+        frontier[rows] = bits
+        targets = np.flatnonzero(np.diff(reverse.offsets))
+        return targets, reduce_or(frontier, reverse.targets, reverse.offsets[targets])
+    positions, _ = gather_edges(graph.offsets, rows)
+    # Row in bits of the frontier node each edge starts from
+    owner_rows = np.repeat(np.arange(len(rows)), graph.offsets[rows + 1] - graph.offsets[rows])
+    targets = graph.targets[positions]
+    order = np.argsort(targets, kind='stable')
+    targets, owner_rows = targets[order], owner_rows[order]
+    starts = np.flatnonzero(np.concatenate([[True], targets[1:] != targets[:-1]]))
+    return targets[starts], reduce_or(bits, owner_rows, starts)
+
+
+def seed_bits(n, seed_ids):
+    """Bit matrix with bit i of row seed_ids[i] set: one little-endian uint64 word per 64 seeds."""
+    bits = np.zeros((n, (len(seed_ids) + 63) // 64), dtype='<u8')
+    columns = np.arange(len(seed_ids))
+    np.bitwise_or.at(bits, (seed_ids, columns // 64), np.left_shift(np.uint64(1), (columns % 64).astype(np.uint64)))
+    return bits
+
+
+def unpack(bits, num_seeds):
+    """(rows, num_seeds) bool matrix of the seed bits of each row."""
+    return np.unpackbits(bits.view(np.uint8), axis=1, bitorder='little', count=num_seeds).astype(bool)
+
+
+def hop_blocks(graph, seed_ids, k, block_size=BLOCK_SIZE, distances=True):
+    """
+    Multi-source BFS up to k hops, block_size seeds at a time.
+    Yields (first seed index of the block, visited bits, hop distances or None).
+    Distances are an int8/int16 (seeds in block, n) array, -1 beyond k hops.
+    """
+    n = graph.num_nodes
+    reverse = graph.reverse()
+    dtype = np.int8 if k < 127 else np.int16
+    for first in range(0, len(seed_ids), block_size):
+        block = np.asarray(seed_ids[first:first + block_size], dtype=np.int64)
+        visited = seed_bits(n, block)
+        rows = np.unique(block)
+        bits = visited[rows]
+        dist = None
+        if distances:
+            dist = np.full((len(block), n), -1, dtype=dtype)
+            dist[np.arange(len(block)), block] = 0
+        for level in range(1, k + 1):
+            targets, reached = advance(graph, reverse, rows, bits)
+            new = reached & ~visited[targets]
+            keep = new.any(axis=1)
+            rows, bits = targets[keep], new[keep]
+            if not len(rows):
+                break
+            visited[rows] |= bits
+            if distances:
+                node_index, seed = np.nonzero(unpack(bits, len(block)))
+                dist[seed, rows[node_index]] = level
+        yield first, visited, dist
+
+
+def seed_ids_of(graph, seeds):
+    ids = [graph.id_of(seed) for seed in seeds]
+    missing = [seed for seed, node_id in zip(seeds, ids) if node_id is None]
+    if missing:
+        raise KeyError("seeds not in the graph: {}".format(missing[:5]))
+    return ids
+
+
+# Batched k-hop neighborhoods
+def k_hop_sets(graph, seeds, k, block_size=BLOCK_SIZE, labels=True):
+    """
+    Parameters:
+    - graph: CSRGraph (adjacency dicts are converted)
+    - seeds: list of start labels
+    - k: number of hops
+    - labels: False returns sorted node id arrays instead of label sets (much cheaper for big neighborhoods)
+    Returns:
+    - one set per seed with the labels of every node within k hops (the seed included)
+    """
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_adjacency(graph)
+    seeds = list(seeds)
+    result = []
+    for first, visited, _ in hop_blocks(graph, seed_ids_of(graph, seeds), k, block_size, distances=False):
+        num_seeds = min(block_size, len(seeds) - first)
+        rows = np.flatnonzero(visited.any(axis=1))
+        groups = []
+        for column in range(num_seeds):
+            if column % 64 == 0:
+                word = visited[rows, column // 64]
+            groups.append(rows[(word >> np.uint64(column % 64)) & np.uint64(1) == 1])
+        if labels:
+            groups = [set(graph.path_labels(group.tolist())) for group in groups]
+        result.extend(groups)
+    return result
+
+
+def k_hop_distances(graph, seeds, k, block_size=BLOCK_SIZE):
+    """(len(seeds), num_nodes) matrix of hop counts over node ids, -1 beyond k hops."""
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_adjacency(graph)
+    seeds = list(seeds)
+    blocks = [dist for _, _, dist in hop_blocks(graph, seed_ids_of(graph, seeds), k, block_size)]
+    return np.concatenate(blocks) if blocks else np.zeros((0, graph.num_nodes), dtype=np.int8)
+
+
+def k_hop_bfs(graph, start, k):
+    """One seed at a time: L52-style queue BFS over node ids that stops k hops out. Returns {node id: hops}."""
+    depth = {start: 0}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        if depth[node] == k:
+            continue
+        for neighbor in graph.neighbors(node):
+            if neighbor not in depth:
+                depth[neighbor] = depth[node] + 1
+                queue.append(neighbor)
+    return depth
+
+
+def main():
+    num_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    num_seeds = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    k = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    graph = random_graph(num_nodes, 8)
+    seeds = random.Random(0).sample(graph.labels, num_seeds)
+    print("Graph: {} nodes, {} edges; {} seeds, {} hops".format(graph.num_nodes, graph.num_edges, num_seeds, k))
+
+    seed_ids = seed_ids_of(graph, seeds)
+    start_time = time.perf_counter()
+    one_by_one = [k_hop_bfs(graph, seed, k) for seed in seed_ids]
+    print("BFS per seed:        {:7.3f} s".format(time.perf_counter() - start_time))
+    start_time = time.perf_counter()
+    batched = k_hop_sets(graph, seeds, k, labels=False)
+    print("Bitset frontiers:    {:7.3f} s".format(time.perf_counter() - start_time))
+    assert all(set(nodes.tolist()) == depth.keys() for nodes, depth in zip(batched, one_by_one))
+    print("Mean neighborhood size: {:.0f} nodes".format(sum(map(len, batched)) / len(batched)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+import os
+import random
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+from csr_graph import CSRGraph
+from direction_optimizing_bfs import top_down_bfs
+from L52 import bfs
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'LAB-8'))
+from L81 import uniform_cost_search
+
+METHODS = ('bfs', 'rcm', 'degree')
+
+
+def undirected_neighbors(graph, by_degree=False):
+    """Both directions of every edge as (offsets, targets) lists, optionally each list sorted by degree."""
+    reverse = graph.reverse()
+    sources = np.concatenate([np.repeat(np.arange(graph.num_nodes), np.diff(graph.offsets)),
+                              np.repeat(np.arange(graph.num_nodes), np.diff(reverse.offsets))])
+    targets = np.concatenate([graph.targets, reverse.targets])
+    degree = np.bincount(sources, minlength=graph.num_nodes)
+    # lexsort: last key is the primary one
+    keys = (targets, degree[targets], sources) if by_degree else (targets, sources)
+    order = np.lexsort(keys)
+    offsets = np.zeros(graph.num_nodes + 1, dtype=np.int64)
+    np.cumsum(degree, out=offsets[1:])
+    return offsets.tolist(), targets[order].tolist(), degree
+
+
+def breadth_first(graph, by_degree):
+    offsets, targets, degree = undirected_neighbors(graph, by_degree)
+    n = graph.num_nodes
+    visited = bytearray(n)
+    order = []
+    # Each component starts from its lowest-degree node when ordering by degree (Cuthill-McKee)
+    roots = np.argsort(degree, kind='stable').tolist() if by_degree else range(n)
+    for root in roots:
+        if visited[root]:
+            continue
+        visited[root] = 1
+        queue = deque([root])
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for neighbor in targets[offsets[node]:offsets[node + 1]]:
+                if not visited[neighbor]:
+                    visited[neighbor] = 1
+                    queue.append(neighbor)
+    return np.array(order, dtype=np.int64)
+
+
+def bfs_order(graph):
+    """Node ids in BFS order over the undirected graph: neighbors get nearby ids."""
+    return breadth_first(graph, by_degree=False)
+
+
+def rcm_order(graph):
+    """Reverse Cuthill-McKee: BFS from a low-degree node, neighbors by increasing degree, reversed."""
+    return breadth_first(graph, by_degree=True)[::-1]
+
+
+def degree_order(graph):
+    """Highest degree first, so the hubs most traversals touch share the same few cache lines."""
+    degree = np.diff(graph.offsets) + np.diff(graph.reverse().offsets)
+    return np.argsort(-degree, kind='stable')
+
+
+# Cache-friendly node reordering
+def reorder(graph, method='rcm'):
+    """
+    Parameters:
+    - graph: adjacency dict or CSRGraph
+    - method: 'bfs', 'rcm' or 'degree'
+    Returns:
+    - CSRGraph with renumbered ids; graph.labels[new_id] is still the original label
+    """
+    if method not in METHODS:
+        raise ValueError("method must be one of {}, got {!r}".format(METHODS, method))
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_adjacency(graph)
+    order = {'bfs': bfs_order, 'rcm': rcm_order, 'degree': degree_order}[method](graph)
+    return graph.permuted(order)
+
+
+def edge_gap(graph):
+    """Mean |u - v| over all edges: how far apart in memory a step along an edge jumps."""
+    sources = np.repeat(np.arange(graph.num_nodes), np.diff(graph.offsets))
+    return float(np.abs(sources - graph.targets).mean()) if graph.num_edges else 0.0
+
+
+def shuffled_grid(size, seed=0):
+    """size x size two-way grid (node row * size + col) listed in random order, like an unordered input."""
+    nodes = list(range(size * size))
+    random.Random(seed).shuffle(nodes)
+    graph = {}
+    for node in nodes:
+        row, col = divmod(node, size)
+        graph[node] = [row * size + c for c in (col - 1, col + 1) if 0 <= c < size]
+        graph[node] += [r * size + col for r in (row - 1, row + 1) if 0 <= r < size]
+    return CSRGraph.from_adjacency(graph)
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    original = shuffled_grid(size)
+    start = original.labels[0]
+    # UCS runs to the node farthest from start, so it settles (almost) the whole grid
+    _, depth = top_down_bfs(original, start)
+    goal = original.labels[int(np.argmax(depth))]
+    print("Grid {} x {}: {} nodes, {} edges".format(size, size, original.num_nodes, original.num_edges))
+    print("{:<10} {:>10} {:>10} {:>14} {:>10} {:>12}".format(
+        "order", "edge gap", "L52 bfs", "vectorized bfs", "L81 ucs", "reorder"))
+    for method in ('input',) + METHODS:
+        start_time = time.perf_counter()
+        graph = original if method == 'input' else reorder(original, method)
+        reorder_time = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        bfs(graph, start, None)
+        bfs_time = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        top_down_bfs(graph, start)
+        vectorized_time = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        uniform_cost_search(graph, start, goal)
+        ucs_time = time.perf_counter() - start_time
+        print("{:<10} {:>10.0f} {:>9.3f}s {:>13.3f}s {:>9.3f}s {:>11.3f}s".format(
+            method, edge_gap(graph), bfs_time, vectorized_time, ucs_time, reorder_time))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+from csr_graph import CSRGraph
+from direction_optimizing_bfs import gather_edges, random_graph, top_down_bfs
+from L52 import bfs
+import shared_arrays
+from shared_arrays import shared_pool
+
+# Below this many frontier nodes a level is expanded here; the pool round trip would cost more
+PARALLEL_THRESHOLD = 4096
+
+
+def expand(frontier, offsets, targets, visited):
+    """
+    Unvisited neighbors of frontier (sorted, no duplicates) and, for each, the first frontier
+    node that reached it. visited is a packed bitmap: bit v & 7 of byte v >> 3.
+    """
+    positions, owners = gather_edges(offsets, frontier)
+    neighbors = targets[positions]
+    new = (visited[neighbors >> 3] >> (neighbors & 7)) & 1 == 0
+    neighbors, first = np.unique(neighbors[new], return_index=True)
+    return neighbors, owners[new][first], len(positions)
+
+
+def run_expand(frontier):
+    return expand(frontier, *shared_arrays.worker_arrays)
+
+
+# Level-synchronous parallel BFS
+def parallel_bfs(graph, start, processes=None, stats=None):
+    """
+    Parameters:
+    - graph: CSRGraph (adjacency dicts are converted)
+    - start: start label
+    - processes: worker processes (default: all cores); 1 runs in this process
+    - stats: optional dict, filled with 'edges_checked' and 'levels'
+    Returns:
+    - parent: int32 array over node ids, parent[start] = start and -1 for unreachable nodes
+    - depth: int32 array of hop distances, -1 for unreachable nodes
+
+    Each level's frontier is split into one chunk per worker. Workers read the CSR arrays and
+    the visited bitmap from shared memory and send back their deduplicated new nodes; this
+    process merges the chunks (first owner wins, so the result does not depend on the number
+    of workers), records parent and depth, and marks the new level in the bitmap.
+    """
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_adjacency(graph)
+    n = graph.num_nodes
+    source = graph.id_of(start)
+    parent = np.full(n, -1, dtype=np.int32)
+    depth = np.full(n, -1, dtype=np.int32)
+    counts = stats if stats is not None else {}
+    counts.update(edges_checked=0, levels=0)
+    if source is None:
+        return parent, depth
+    processes = processes or os.cpu_count() or 1
+
+    visited = np.zeros((n + 7) // 8, dtype=np.uint8)
+    with shared_pool([graph.offsets, graph.targets, visited], processes) as ((offsets, targets, visited), pool):
+        parent[source] = source
+        depth[source] = 0
+        visited[source >> 3] |= 1 << (source & 7)
+        frontier = np.array([source], dtype=np.int32)
+        level = 0
+        while len(frontier):
+            if pool is None or len(frontier) < PARALLEL_THRESHOLD:
+                neighbors, owners, checked = expand(frontier, offsets, targets, visited)
+            else:
+                results = pool.map(run_expand, np.array_split(frontier, processes))
+                neighbors = np.concatenate([result[0] for result in results])
+                owners = np.concatenate([result[1] for result in results])
+                checked = sum(result[2] for result in results)
+                # Chunks are in frontier order, so the first copy of a node has the earliest owner
+                neighbors, first = np.unique(neighbors, return_index=True)
+                owners = owners[first]
+            level += 1
+            parent[neighbors] = owners
+            depth[neighbors] = level
+            np.bitwise_or.at(visited, neighbors >> 3, (1 << (neighbors & 7)).astype(np.uint8))
+            counts['edges_checked'] += checked
+            frontier = neighbors.astype(np.int32)
+        counts['levels'] = level - 1
+        return parent, depth
+
+
+def main():
+    num_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    degree = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    graph = random_graph(num_nodes, degree)
+    start = random.Random(0).choice(graph.labels)
+    print("Graph: {} nodes, {} edges, start {}".format(graph.num_nodes, graph.num_edges, start))
+
+    start_time = time.perf_counter()
+    bfs(graph, start, None)
+    print("L52 bfs (queue):              {:7.3f} s".format(time.perf_counter() - start_time))
+    _, expected_depth = top_down_bfs(graph, start)
+
+    baseline = None
+    processes = 1
+    while True:
+        start_time = time.perf_counter()
+        parent, depth = parallel_bfs(graph, start, processes)
+        elapsed = time.perf_counter() - start_time
+        baseline = baseline or elapsed
+        assert np.array_equal(depth, expected_depth)
+        print("parallel_bfs, {:>2} process(es): {:7.3f} s  ({:.2f}x)".format(processes, elapsed, baseline / elapsed))
+        if processes >= (os.cpu_count() or 1):
+            break
+        processes = min(processes * 2, os.cpu_count())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+import random
+import sys
+import time
+
+import numpy as np
+
+from csr_graph import CSRGraph
+from graph_io import build_csr
+from L52 import bfs
+
+
+def strongly_connected_components(graph):
+    """
+    Iterative Tarjan over a CSRGraph (no recursion limit on long chains).
+    Returns (component, num_components): component[v] is the SCC id of node v, and ids are
+    handed out sinks first, so every edge between components goes to a smaller id.
+    """
+    n = graph.num_nodes
+    offsets, targets = graph.offsets_view, graph.targets_view
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    component = [-1] * n
+    stack = []
+    counter = 0
+    num_components = 0
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        # Each entry: (node, position of the next out-edge to look at)
+        work = [(root, offsets[root])]
+        while work:
+            v, i = work[-1]
+            end = offsets[v + 1]
+            while i < end:
+                w = targets[i]
+                i += 1
+                if index[w] == -1:
+                    work[-1] = (v, i)
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, offsets[w]))
+                    break
+                if on_stack[w] and index[w] < low[v]:
+                    low[v] = index[w]
+            else:
+                # All edges of v done
+                work.pop()
+                if low[v] == index[v]:
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        component[w] = num_components
+                        if w == v:
+                            break
+                    num_components += 1
+                if work:
+                    u = work[-1][0]
+                    if low[v] < low[u]:
+                        low[u] = low[v]
+    return np.array(component, dtype=np.int32), num_components
+
+
+def condensation(graph, component, num_components):
+    """The DAG of SCCs as a CSRGraph over component ids (duplicate edges and self-loops dropped)."""
+    sources = np.repeat(component, np.diff(graph.offsets))
+    targets = component[graph.targets]
+    between = sources != targets
+    keys = np.unique(sources[between].astype(np.int64) * num_components + targets[between])
+    offsets = np.zeros(num_components + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys // num_components, minlength=num_components), out=offsets[1:])
+    return CSRGraph(list(range(num_components)), offsets, (keys % num_components).astype(np.int32))
+
+
+# Reachability index over the SCC condensation
+class ReachabilityIndex:
+    """
+    Answers "can start reach goal?" without searching.
+
+    Nodes in the same SCC always reach each other. Between SCCs the condensation DAG is
+    labelled once: with at most bitset_limit components every component keeps the exact
+    set of components it reaches as a bitset (a Python int). Larger graphs get
+    O(1) filters instead: the height of each component in the DAG (a path only goes down)
+    and GRAIL interval labels from a few random DFS orders (if u reaches v, v's interval
+    lies inside u's in every order). These only ever say "no" when it is true, so
+    may_reach is exact with bitsets and otherwise "no" or "maybe".
+    """
+
+    def __init__(self, graph, bitset_limit=10000, num_intervals=2, seed=0):
+        if not isinstance(graph, CSRGraph):
+            graph = CSRGraph.from_adjacency(graph)
+        self.index = graph.index
+        self.component, self.num_components = strongly_connected_components(graph)
+        self.dag = condensation(graph, self.component, self.num_components)
+        self.reach = None
+        if self.num_components <= bitset_limit:
+            self.build_bitsets()
+        else:
+            self.build_labels(num_intervals, seed)
+
+    def build_bitsets(self):
+        offsets, targets = self.dag.offsets_view, self.dag.targets_view
+        reach = []
+        # Successors have smaller ids, so they are finished first
+        for c in range(self.num_components):
+            bits = 1 << c
+            for i in range(offsets[c], offsets[c + 1]):
+                bits |= reach[targets[i]]
+            reach.append(bits)
+        self.reach = reach
+
+    def build_labels(self, num_intervals, seed):
+        offsets, targets = self.dag.offsets_view, self.dag.targets_view
+        height = [0] * self.num_components
+        for c in range(self.num_components):
+            for i in range(offsets[c], offsets[c + 1]):
+                if height[targets[i]] + 1 > height[c]:
+                    height[c] = height[targets[i]] + 1
+        self.height = height
+
+        rng = random.Random(seed)
+        self.intervals = []
+        for _ in range(num_intervals):
+            post = [-1] * self.num_components
+            counter = 0
+            roots = list(range(self.num_components))
+            rng.shuffle(roots)
+            for root in roots:
+                if post[root] != -1:
+                    continue
+                post[root] = -2  # on the DFS path
+                work = [(root, self.shuffled_children(root, rng))]
+                while work:
+                    c, children = work[-1]
+                    if children:
+                        child = children.pop()
+                        if post[child] == -1:
+                            post[child] = -2
+                            work.append((child, self.shuffled_children(child, rng)))
+                    else:
+                        work.pop()
+                        post[c] = counter
+                        counter += 1
+            # low[c]: smallest post number among everything c reaches
+            low = post[:]
+            for c in range(self.num_components):
+                for i in range(offsets[c], offsets[c + 1]):
+                    if low[targets[i]] < low[c]:
+                        low[c] = low[targets[i]]
+            self.intervals.append((low, post))
+
+    def shuffled_children(self, c, rng):
+        children = self.dag.targets[self.dag.offsets[c]:self.dag.offsets[c + 1]].tolist()
+        rng.shuffle(children)
+        return children
+
+    def may_reach(self, start, goal):
+        """False only if there is certainly no start -> goal path. Unknown labels are never rejected."""
+        start_id, goal_id = self.index.get(start), self.index.get(goal)
+        if start_id is None or goal_id is None:
+            return True
+        u, v = self.component[start_id], self.component[goal_id]
+        if u == v:
+            return True
+        if self.reach is not None:
+            return bool(self.reach[u] >> int(v) & 1)
+        if self.height[u] <= self.height[v]:
+            return False
+        for low, post in self.intervals:
+            if not low[u] <= low[v] <= post[v] <= post[u]:
+                return False
+        return True
+
+
+def random_digraph(num_nodes, degree, seed=0):
+    """Sparse random directed graph as a CSRGraph: many small SCCs hanging off one big one."""
+    rng = np.random.default_rng(seed)
+    sources = rng.integers(0, num_nodes, num_nodes * degree, dtype=np.int32)
+    targets = rng.integers(0, num_nodes, num_nodes * degree, dtype=np.int32)
+    return build_csr([str(i) for i in range(num_nodes)], sources, targets)
+
+
+def main():
+    num_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    graph = random_digraph(num_nodes, 2)
+    start_time = time.perf_counter()
+    reachability = ReachabilityIndex(graph)
+    print("{} nodes -> {} SCCs, index built in {:.2f} s ({})".format(
+        graph.num_nodes, reachability.num_components, time.perf_counter() - start_time,
+        "bitsets" if reachability.reach is not None else "height + interval labels"))
+
+    rng = random.Random(1)
+    queries = [(rng.choice(graph.labels), rng.choice(graph.labels)) for _ in range(200)]
+    # The index only matters for queries with no path, so time those
+    queries = [(start, goal) for start, goal in queries if not bfs(graph, start, goal)]
+    rejected = sum(1 for start, goal in queries if not reachability.may_reach(start, goal))
+    print("{} of {} unreachable queries rejected without a search".format(rejected, len(queries)))
+    for name, index in (("bfs", None), ("bfs + reachability", reachability)):
+        start_time = time.perf_counter()
+        for start, goal in queries:
+            bfs(graph, start, goal, index)
+        print("{:<20} {:.3f} s".format(name + ":", time.perf_counter() - start_time))
+
+if __name__ == "__main__":
+    main()
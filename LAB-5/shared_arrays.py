@@ -0,0 +1,59 @@
+from contextlib import contextmanager
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+# Per-process views of the shared arrays, set once by init_worker
+worker_blocks = None
+worker_arrays = None
+
+
+def share(array):
+    """Copy array into a new shared memory block; returns (block, array view of the block)."""
+    block = SharedMemory(create=True, size=max(array.nbytes, 1))
+    view = np.ndarray(array.shape, array.dtype, buffer=block.buf)
+    view[:] = array
+    return block, view
+
+
+def init_worker(specs):
+    """Runs once in every worker: attaches to the shared arrays (shared_arrays.worker_arrays)."""
+    global worker_blocks, worker_arrays
+    worker_blocks = [SharedMemory(name=name) for name, _, _ in specs]
+    worker_arrays = [np.ndarray(shape, dtype, buffer=block.buf)
+                     for block, (_, shape, dtype) in zip(worker_blocks, specs)]
+
+
+# Worker pool over arrays in shared memory
+@contextmanager
+def shared_pool(arrays, processes):
+    """
+    Parameters:
+    - arrays: numpy arrays to copy into shared memory
+    - processes: worker processes; 1 creates no pool
+    Yields:
+    - (views, pool): writable views of the shared copies for this process, and a Pool whose
+      workers see the same memory as shared_arrays.worker_arrays (None when processes == 1)
+
+    The pool is shut down and the shared blocks are freed on exit, also after an error.
+    """
+    blocks = []
+    pool = None
+    try:
+        views = []
+        for array in arrays:
+            block, view = share(np.ascontiguousarray(array))
+            blocks.append(block)
+            views.append(view)
+        if processes > 1:
+            specs = [(block.name, view.shape, view.dtype) for block, view in zip(blocks, views)]
+            pool = Pool(processes, initializer=init_worker, initargs=(specs,))
+        yield views, pool
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        for block in blocks:
+            block.close()
+            block.unlink()
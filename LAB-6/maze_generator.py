@@ -0,0 +1,258 @@
+import random
+import struct
+import sys
+import time
+from array import array
+import numpy as np
+
+# Wall bits of a cell, in the order of the Cell.walls dict in L62
+TOP, LEFT, BOTTOM, RIGHT = 1, 2, 4, 8
+ALL_WALLS = TOP | LEFT | BOTTOM | RIGHT
+METHODS = ('backtracker', 'kruskal', 'eller')
+
+# File header: magic, rows, cols (little-endian uint32; rows 0 = until end of file); then
+# (cols + 1) // 2 bytes per row, two cells per byte with the even column in the low 4 bits
+MAGIC = b'MAZ4'
+HEADER = struct.Struct('<4sII')
+
+
+# Recursive backtracker without pygame
+def recursive_backtracker(rows, cols, seed=None):
+    """
+    Parameters:
+    - rows, cols: maze size in cells
+    - seed: seed for random.Random
+    Returns:
+    - (rows, cols) uint8 array of wall bits (TOP, LEFT, BOTTOM, RIGHT)
+
+    The same walk as L62: start in the top-left cell, carve into a random unvisited neighbor
+    (random.choice over top, left, bottom, right) and back up when stuck. With the same random
+    state it carves the same maze as L62. Instead of an explicit stack each cell remembers the
+    direction it was entered from, and the grid is padded with a visited border so neighbors
+    need no bounds checks.
+    """
+    rng = random.Random(seed)
+    width = cols + 2
+    visited = bytearray(b'\x01') * ((rows + 2) * width)
+    for row in range(1, rows + 1):
+        visited[row * width + 1:row * width + 1 + cols] = bytes(cols)
+    walls = bytearray([ALL_WALLS]) * len(visited)
+    # came_from[cell]: 1 + direction index of the move into cell, 0 for the start cell
+    came_from = bytearray(len(visited))
+    offsets = (-width, -1, width, 1)
+    bits = (TOP, LEFT, BOTTOM, RIGHT)
+    opposite = (BOTTOM, RIGHT, TOP, LEFT)
+    current = width + 1
+    visited[current] = 1
+    while True:
+        neighbors = [direction for direction in (0, 1, 2, 3) if not visited[current + offsets[direction]]]
+        if neighbors:
+            direction = rng.choice(neighbors)
+            next_cell = current + offsets[direction]
+            visited[next_cell] = 1
+            walls[current] &= ~bits[direction]
+            walls[next_cell] &= ~opposite[direction]
+            came_from[next_cell] = direction + 1
+            current = next_cell
+        elif came_from[current]:
+            current -= offsets[came_from[current] - 1]
+        else:
+            break
+    return np.frombuffer(walls, dtype=np.uint8).reshape(rows + 2, width)[1:-1, 1:-1].copy()
+
+
+# Randomized Kruskal with union-find
+def kruskal(rows, cols, seed=None):
+    """
+    Same output format as recursive_backtracker. Every inner wall is visited once in a random
+    order (np.random.default_rng(seed)) and removed when the cells on both sides are not
+    connected yet. Union-find with path halving over an int32 array; stops as soon as all
+    cells are joined.
+    """
+    n = rows * cols
+    horizontal = rows * (cols - 1)
+    rng = np.random.default_rng(seed)
+    order = np.arange(horizontal + (rows - 1) * cols, dtype=np.int64 if n >= 2 ** 30 else np.int32)
+    rng.shuffle(order)
+    parent = array('i', np.arange(n, dtype=np.int32).tobytes())
+    walls = bytearray([ALL_WALLS]) * n
+    remaining = n - 1
+    for first in range(0, len(order), 1 << 20):
+        for wall in order[first:first + (1 << 20)].tolist():
+            # Walls 0..horizontal-1 separate cell and cell + 1, the rest cell and cell + cols
+            if wall < horizontal:
+                row, col = divmod(wall, cols - 1)
+                a = row * cols + col
+                b, bit_a, bit_b = a + 1, RIGHT, LEFT
+            else:
+                a = wall - horizontal
+                b, bit_a, bit_b = a + cols, BOTTOM, TOP
+            root_a, root_b = a, b
+            while parent[root_a] != root_a:
+                parent[root_a] = root_a = parent[parent[root_a]]
+            while parent[root_b] != root_b:
+                parent[root_b] = root_b = parent[parent[root_b]]
+            if root_a != root_b:
+                parent[root_a] = root_b
+                walls[a] &= ~bit_a
+                walls[b] &= ~bit_b
+                remaining -= 1
+        if not remaining:
+            break
+    return np.frombuffer(walls, dtype=np.uint8).reshape(rows, cols).copy()
+
+
+# Eller's algorithm: one row at a time
+def eller_rows(cols, rows=None, seed=None):
+    """
+    Parameters:
+    - cols: maze width in cells
+    - rows: number of rows, or None for an endless maze
+    - seed: seed for np.random.default_rng
+    Yields:
+    - one (cols,) uint8 array of wall bits per row, top to bottom
+
+    Only the current row is kept: the set (connected group) of each of its cells. Adjacent
+    cells of different sets are joined at random, then every set opens at least one cell
+    downwards, and cells below an opening inherit its set. The last row joins all remaining
+    sets, so a finite maze is perfect like the other methods. Memory is O(cols).
+    """
+    rng = np.random.default_rng(seed)
+    sets = np.arange(cols)
+    top = np.ones(cols, dtype=bool)
+    row = 0
+    while rows is None or row < rows:
+        last = rows is not None and row == rows - 1
+        join = np.ones(cols - 1, dtype=bool) if last else rng.random(cols - 1) < 0.5
+        right = np.ones(cols, dtype=bool)
+        # Sets are numbered 0..cols-1 in every row, so union-find over a list of cols entries
+        parent = list(range(cols))
+        labels = sets.tolist()
+
+        def find(label):
+            while parent[label] != label:
+                parent[label] = label = parent[parent[label]]
+            return label
+
+        for col in np.flatnonzero(join).tolist():
+            a, b = find(labels[col]), find(labels[col + 1])
+            if a != b:
+                parent[b] = a
+                right[col] = False
+        labels = np.array([find(label) for label in labels])
+        bottom = np.ones(cols, dtype=bool)
+        if not last:
+            down = rng.random(cols) < 0.5
+            # Sets with no way down open one random member
+            has_down = np.bincount(labels, weights=down, minlength=cols) > 0
+            order = np.lexsort((rng.random(cols), labels))
+            first = order[np.concatenate([[True], labels[order][1:] != labels[order][:-1]])]
+            down[first[~has_down[labels[first]]]] = True
+            bottom = ~down
+        left = np.concatenate([[True], right[:-1]])
+        yield (TOP * top | LEFT * left | BOTTOM * bottom | RIGHT * right).astype(np.uint8)
+        # Cells below an opening keep their set, the others start new ones; renumber to 0..cols-1
+        _, sets = np.unique(np.where(bottom, cols + np.arange(cols), labels), return_inverse=True)
+        top = bottom
+        row += 1
+
+
+def generate(rows, cols, method='backtracker', seed=None):
+    """Wall-bit array of a perfect maze (exactly one path between any two cells)."""
+    if method not in METHODS:
+        raise ValueError("method must be one of {}, got {!r}".format(METHODS, method))
+    if rows < 1 or cols < 1:
+        raise ValueError("a maze needs at least one row and one column")
+    if method == 'eller':
+        return np.array(list(eller_rows(cols, rows, seed)), dtype=np.uint8).reshape(rows, cols)
+    return {'backtracker': recursive_backtracker, 'kruskal': kruskal}[method](rows, cols, seed)
+
+
+def save_maze(walls, path):
+    """Write walls to path in the 4-bits-per-cell format (about rows * cols / 2 bytes)."""
+    rows, cols = walls.shape
+    padded = walls if cols % 2 == 0 else np.pad(walls, ((0, 0), (0, 1)))
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, rows, cols))
+        file.write((padded[:, 0::2] | (padded[:, 1::2] << 4)).astype(np.uint8).tobytes())
+
+
+def pack_row(row):
+    """One row of wall bits as (cols + 1) // 2 bytes, the even column in the low 4 bits."""
+    if len(row) % 2:
+        row = np.append(row, np.uint8(0))
+    return (row[0::2] | (row[1::2] << 4)).astype(np.uint8).tobytes()
+
+
+def stream_maze(path, cols, rows=None, seed=None):
+    """
+    Write an Eller maze to path row by row in the save_maze format, holding one row at a time.
+    rows=None writes an endless maze (header rows 0), e.g. into a pipe for a consumer.
+    """
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, rows or 0, cols))
+        for row in eller_rows(cols, rows, seed):
+            file.write(pack_row(row))
+
+
+def read_rows(path):
+    """Rows of a maze file one at a time, as (cols,) uint8 wall-bit arrays."""
+    with open(path, 'rb') as file:
+        magic, rows, cols = HEADER.unpack(file.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError("{} is not a maze file".format(path))
+        row_bytes = (cols + 1) // 2
+        count = 0
+        while not rows or count < rows:
+            packed = file.read(row_bytes)
+            if len(packed) < row_bytes:
+                return
+            packed = np.frombuffer(packed, dtype=np.uint8)
+            yield np.stack([packed & 15, packed >> 4], axis=1).reshape(-1)[:cols]
+            count += 1
+
+
+def load_maze(path):
+    """Read a maze file (save_maze or stream_maze) back into a (rows, cols) uint8 wall-bit array."""
+    with open(path, 'rb') as file:
+        magic, rows, cols = HEADER.unpack(file.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError("{} is not a maze file".format(path))
+        packed = np.fromfile(file, dtype=np.uint8, count=rows * ((cols + 1) // 2) if rows else -1)
+    packed = packed.reshape(-1, (cols + 1) // 2)
+    walls = np.empty((len(packed), packed.shape[1] * 2), dtype=np.uint8)
+    walls[:, 0::2] = packed & 15
+    walls[:, 1::2] = packed >> 4
+    return walls[:, :cols]
+
+
+def to_grid(walls, free=1):
+    """
+    Maze as a (2 * rows + 1, 2 * cols + 1) 0/1 grid for the grid solvers: cell (r, c) becomes
+    grid[2r + 1][2c + 1]. free=1 gives L71-style mazes, free=0 the L101/L102 convention.
+    """
+    rows, cols = walls.shape
+    wall = 1 - free
+    grid = np.full((2 * rows + 1, 2 * cols + 1), wall, dtype=np.uint8)
+    grid[1::2, 1::2] = free
+    grid[1::2, 2:-1:2] = np.where(walls[:, :-1] & RIGHT, wall, free)
+    grid[2:-1:2, 1::2] = np.where(walls[:-1] & BOTTOM, wall, free)
+    return grid
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    cols = int(sys.argv[2]) if len(sys.argv) > 2 else rows
+    methods = [sys.argv[3]] if len(sys.argv) > 3 else METHODS
+    path = sys.argv[4] if len(sys.argv) > 4 else None
+    for method in methods:
+        start_time = time.perf_counter()
+        walls = generate(rows, cols, method, seed=0)
+        print("{:<12} {} x {}: {:7.3f} s".format(method, rows, cols, time.perf_counter() - start_time))
+    if path:
+        save_maze(walls, path)
+        print("Saved to {} ({} bytes)".format(path, HEADER.size + rows * ((cols + 1) // 2)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,57 +1,105 @@
+from array import array
 from collections import deque
+# Flat grid: the maze with a wall border, one byte per cell (1 = open), cell = (x + 1) * width + (y + 1)
+def grid_cells(maze):
+    width = len(maze[0]) + 2
+    cells = bytearray(width)
+    for row in maze:
+        cells += b'\x00' + bytes(value == 1 for value in row) + b'\x00'
+    cells += bytearray(width)
+    return cells, width
+# Walk the predecessor array back from the goal once, instead of copying the path into every queue entry
+def rebuild_path(parent, cell, width):
+    path = []
+    while True:
+        x, y = divmod(cell, width)
+        path.append((x - 1, y - 1))
+        if parent[cell] == cell:
+            return path[::-1]
+        cell = parent[cell]
 def bfs(maze, start, end):
-    queue = deque([(start, [start])])
-    visited = set()
+    cells, width = grid_cells(maze)
+    source = (start[0] + 1) * width + start[1] + 1
+    goal = (end[0] + 1) * width + end[1] + 1
+    parent = array('i', [-1]) * len(cells)
+    seen = bytearray(len(cells))
+    parent[source] = source
+    seen[source] = 1
+    queue = deque([source])
     nodes_explored = 0
     while queue:
-        (x, y), path = queue.popleft()
-        if (x, y) == end:
-            return path, nodes_explored
-        if (x, y) in visited:
-            continue
-        visited.add((x, y))
+        cell = queue.popleft()
+        if cell == goal:
+            return rebuild_path(parent, cell, width), nodes_explored
         nodes_explored += 1
-        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < len(maze) and 0 <= ny < len(maze[0]) and maze[nx][ny] == 1:
-                queue.append(((nx, ny), path + [(nx, ny)]))
+        for neighbor in (cell - width, cell + width, cell - 1, cell + 1):
+            if cells[neighbor] and not seen[neighbor]:
+                seen[neighbor] = 1
+                parent[neighbor] = cell
+                queue.append(neighbor)
     return None, nodes_explored
 def dfs(maze, start, end):
-    stack = [(start, [start])]
-    visited = set()
+    cells, width = grid_cells(maze)
+    source = (start[0] + 1) * width + start[1] + 1
+    goal = (end[0] + 1) * width + end[1] + 1
+    parent = array('i', [-1]) * len(cells)
+    visited = bytearray(len(cells))
+    parent[source] = source
+    stack = [source]
     nodes_explored = 0
     while stack:
-        (x, y), path = stack.pop()
-        if (x, y) == end:
-            return path, nodes_explored
-        if (x, y) in visited:
+        cell = stack.pop()
+        if cell == goal:
+            return rebuild_path(parent, cell, width), nodes_explored
+        if visited[cell]:
             continue
-        visited.add((x, y))
+        visited[cell] = 1
         nodes_explored += 1
-        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < len(maze) and 0 <= ny < len(maze[0]) and maze[nx][ny] == 1:
-                stack.append(((nx, ny), path + [(nx, ny)]))
+        for neighbor in (cell - width, cell + width, cell - 1, cell + 1):
+            if cells[neighbor] and not visited[neighbor]:
+                # The latest push is popped first, so it is the parent the old path copies would have kept
+                parent[neighbor] = cell
+                stack.append(neighbor)
     return None, nodes_explored
-def iddfs(maze, start, end, max_depth):
-    def dls(node, depth, path):
-        if depth == 0:
-            return None
-        if node == end:
-            return path
-        x, y = node
-        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            nx, ny = x + dx, y + dy
-            if (0 <= nx < len(maze) and 0 <= ny < len(maze[0]) and maze[nx][ny] == 1
-                    and (nx, ny) not in path):
-                result = dls((nx, ny), depth - 1, path + [(nx, ny)])
-                if result:
-                    return result
-        return None
+def iddfs(maze, start, end, max_depth, stats=None):
+    cells, width = grid_cells(maze)
+    source = (start[0] + 1) * width + start[1] + 1
+    goal = (end[0] + 1) * width + end[1] + 1
+    # Transposition table: fewest moves each cell has been reached with, in any iteration
+    best = array('i', [max_depth]) * len(cells)
+    parent = array('i', [-1]) * len(cells)
+    best[source] = 0
+    parent[source] = source
+    counts = stats if stats is not None else {}
+    counts.update(nodes_explored=0, iterations=[])
+    # Cells cut off at the previous depth limit; the next iteration resumes from them instead of the root
+    frontier = [source]
     for depth in range(1, max_depth + 1):
-        result = dls(start, depth, [start])
-        if result:
-            return result, depth
+        limit = depth - 1
+        stack = frontier
+        frontier = []
+        explored = 0
+        while stack:
+            cell = stack.pop()
+            if cell == goal:
+                counts['iterations'].append(explored)
+                counts['nodes_explored'] += explored
+                return rebuild_path(parent, cell, width), depth
+            moves = best[cell]
+            if moves == limit:
+                frontier.append(cell)
+                continue
+            explored += 1
+            for neighbor in (cell - width, cell + width, cell - 1, cell + 1):
+                # Prune cells already reached with as few moves
+                if cells[neighbor] and moves + 1 < best[neighbor]:
+                    best[neighbor] = moves + 1
+                    parent[neighbor] = cell
+                    stack.append(neighbor)
+        counts['iterations'].append(explored)
+        counts['nodes_explored'] += explored
+        if not frontier:
+            break
     return None, max_depth
 maze = [
     [1, 0, 1, 1, 1],
@@ -64,10 +112,13 @@ start = (0, 0)
 end = (4, 4)
 bfs_path, bfs_nodes = bfs(maze, start, end)
 dfs_path, dfs_nodes = dfs(maze, start, end)
-iddfs_path, iddfs_nodes = iddfs(maze, start, end, 20)
+iddfs_stats = {}
+iddfs_path, iddfs_depth = iddfs(maze, start, end, 20, iddfs_stats)
+iddfs_nodes = iddfs_stats['nodes_explored']
 print("BFS Path:", bfs_path, "Nodes explored:", bfs_nodes)
 print("DFS Path:", dfs_path, "Nodes explored:", dfs_nodes)
-print("IDDFS Path:", iddfs_path, "Nodes explored:", iddfs_nodes)
+print("IDDFS Path:", iddfs_path, "Depth:", iddfs_depth, "Nodes explored:", iddfs_nodes)
+print("IDDFS nodes explored per iteration:", iddfs_stats['iterations'])
 if bfs_nodes <= dfs_nodes and bfs_nodes <= iddfs_nodes:
     print("BFS is the best in terms of explored nodes for shortest path.")
 elif dfs_nodes <= bfs_nodes and dfs_nodes <= iddfs_nodes:
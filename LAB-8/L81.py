@@ -1,41 +1,117 @@
 import heapq
+import os
+import sys
 from collections import deque
+from functools import lru_cache
 import networkx as nx
 import matplotlib.pyplot as plt
-def visualize_graph(graph, path, title):
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'LAB-5'))
+from csr_graph import CSRGraph
+from graph_io import load_graph
+MAX_DRAWN_NODES = 1000
+LABELED_NODES = 60
+def edge_list(graph, node):
+    if isinstance(graph, CSRGraph):
+        return [(graph.labels[neighbor], weight) for neighbor, weight in graph.edges(graph.id_of(node))]
+    return graph.get(node, [])
+def nodes_to_draw(graph, path, hops=2, max_nodes=MAX_DRAWN_NODES):
+    # Small graphs are drawn whole; large ones only as the path (or first node) plus its hops-hop out-neighborhood
+    if len(graph) <= max_nodes:
+        return list(graph)
+    nodes = list(dict.fromkeys(path)) if path else [next(iter(graph))]
+    seen = set(nodes)
+    frontier = nodes
+    for _ in range(hops):
+        next_frontier = []
+        for node in frontier:
+            for neighbor, _ in edge_list(graph, node):
+                if neighbor not in seen and len(nodes) < max_nodes:
+                    seen.add(neighbor)
+                    nodes.append(neighbor)
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+    return nodes
+# Layouts keyed by the drawn structure, so graphs with the same nodes and edges share one spring_layout;
+# bounded, since every distinct graph or path neighborhood adds a key
+@lru_cache(maxsize=32)
+def cached_layout(nodes, edges):
     G = nx.DiGraph()
-    for node in graph:
-        G.add_node(node)
-        for neighbor, weight in graph[node]:
-            G.add_edge(node, neighbor, weight=weight)
-    pos = nx.spring_layout(G, seed=42)
-    node_colors = []
-    edge_colors = []
-    path_edges = []
-    if path:
-        path_edges = [(path[i], path[i + 1]) for i in range(len(path) - 1)]
-        for edge in G.edges():
-            if edge in path_edges or (edge[1], edge[0]) in path_edges:
-                edge_colors.append('red')
-            else:
-                edge_colors.append('gray')
-        for node in G.nodes():
-            if node in path:
-                node_colors.append('red')
-            else:
-                node_colors.append('lightblue')
+    G.add_nodes_from(nodes)
+    G.add_edges_from(edges)
+    return nx.spring_layout(G, seed=42)
+def graph_layout(graph, nodes):
+    drawn = set(nodes)
+    edges = tuple((node, neighbor) for node in nodes for neighbor, _ in edge_list(graph, node) if neighbor in drawn)
+    return cached_layout(tuple(nodes), edges)
+def draw_graph(ax, graph, path, title, nodes, pos):
+    path_nodes = set(path or [])
+    path_edges = set(zip(path, path[1:])) if path else set()
+    # Labels and arrowheads only while they stay readable
+    labeled = len(nodes) <= LABELED_NODES
+    segments, edge_colors, arrows, weights = [], [], [], []
+    for node in nodes:
+        for neighbor, weight in edge_list(graph, node):
+            if neighbor not in pos:
+                continue
+            (x1, y1), (x2, y2) = pos[node], pos[neighbor]
+            segments.append(((x1, y1), (x2, y2)))
+            on_path = (node, neighbor) in path_edges or (neighbor, node) in path_edges
+            edge_colors.append('red' if on_path else 'gray')
+            length = ((x2 - x1) ** 2 + (y2 - y1) ** 2) ** 0.5
+            if labeled and length > 0:
+                # Arrowhead 70% of the way along, clear of the target node's circle
+                arrows.append((x1 + 0.7 * (x2 - x1), y1 + 0.7 * (y2 - y1),
+                               (x2 - x1) / length, (y2 - y1) / length, edge_colors[-1]))
+            weights.append(((x1 + x2) / 2, (y1 + y2) / 2, weight))
+    # One collection for all edges (and one for all arrowheads) instead of a patch per edge
+    ax.add_collection(LineCollection(segments, colors=edge_colors, linewidths=1.0, zorder=1))
+    if arrows:
+        x, y, dx, dy, colors = zip(*arrows)
+        ax.quiver(x, y, dx, dy, color=colors, angles='xy', pivot='tip', scale=40, width=0.003,
+                  headwidth=5, headlength=6, zorder=1)
+    xs = [pos[node][0] for node in nodes]
+    ys = [pos[node][1] for node in nodes]
+    node_colors = ['red' if node in path_nodes else 'lightblue' for node in nodes]
+    ax.scatter(xs, ys, s=800 if labeled else 30, c=node_colors, zorder=2)
+    if labeled:
+        for node, x, y in zip(nodes, xs, ys):
+            ax.text(x, y, str(node), fontsize=12, ha='center', va='center', zorder=3)
+        for x, y, weight in weights:
+            ax.text(x, y, str(weight), fontsize=10, ha='center', va='center', zorder=3,
+                    bbox=dict(boxstyle='round', fc='white', ec='none'))
+    ax.set_title(title)
+    ax.set_axis_off()
+    ax.autoscale_view()
+def visualize_graph(graph, path, title, show=True, directory='.', hops=2):
+    # show=False renders on a bare Agg canvas: no GUI backend or pyplot state, safe on headless machines
+    nodes = nodes_to_draw(graph, path, hops)
+    pos = graph_layout(graph, nodes)
+    if show:
+        fig = plt.figure(figsize=(10, 6))
     else:
-        node_colors = 'lightblue'
-        edge_colors = 'gray'
-    plt.figure(figsize=(10, 6))
-    nx.draw(G, pos, with_labels=True, node_color=node_colors, edge_color=edge_colors,
-            node_size=800, font_size=12, arrows=True)
-    edge_labels = nx.get_edge_attributes(G, 'weight')
-    nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels)
-    plt.title(title)
-    plt.savefig(f"{title.replace(' ', '_')}.png")
-    plt.show()
-def uniform_cost_search(graph, start, goal):
+        fig = Figure(figsize=(10, 6))
+        FigureCanvasAgg(fig)
+    draw_graph(fig.add_subplot(), graph, path, title, nodes, pos)
+    filename = os.path.join(directory, f"{title.replace(' ', '_')}.png")
+    fig.savefig(filename)
+    if show:
+        plt.show()
+    return filename
+def export_graphs(jobs, directory='.'):
+    # Headless batch export: jobs are (graph, path, title); returns the PNG file names
+    os.makedirs(directory, exist_ok=True)
+    return [visualize_graph(graph, path, title, show=False, directory=directory) for graph, path, title in jobs]
+def uniform_cost_search(graph, start, goal, stats=None, reachability=None):
+    if reachability is not None and not reachability.may_reach(start, goal):
+        if stats is not None:
+            stats['settled'] = 0
+        return None, None
+    if isinstance(graph, CSRGraph):
+        return uniform_cost_search_csr(graph, start, goal, stats)
+    settled = 0
     priority_queue = []
     heapq.heappush(priority_queue, (0, start))
     cost_so_far = {start: 0}
@@ -43,15 +119,19 @@ def uniform_cost_search(graph, start, goal):
     while priority_queue:
         current_cost, current_node = heapq.heappop(priority_queue)
         if current_node == goal:
+            settled += 1
             break
         if current_cost > cost_so_far[current_node]:
             continue
+        settled += 1
         for neighbor, edge_cost in graph.get(current_node, []):
             new_cost = current_cost + edge_cost
             if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
                 cost_so_far[neighbor] = new_cost
                 parent[neighbor] = current_node
                 heapq.heappush(priority_queue, (new_cost, neighbor))
+    if stats is not None:
+        stats['settled'] = settled
     path = []
     node = goal
     if node not in parent:
@@ -61,7 +141,11 @@ def uniform_cost_search(graph, start, goal):
         node = parent[node]
     path.reverse()
     return path, cost_so_far.get(goal, None)
-def bfs(graph, start, goal):
+def bfs(graph, start, goal, reachability=None):
+    if reachability is not None and not reachability.may_reach(start, goal):
+        return None, None
+    if isinstance(graph, CSRGraph):
+        return bfs_csr(graph, start, goal)
     queue = deque([start])
     parent = {start: None}
     visited = set([start])
@@ -84,6 +168,164 @@ def bfs(graph, start, goal):
     path.reverse()
     cost = len(path) - 1
     return path, cost
+def uniform_cost_search_csr(graph, start, goal, stats=None):
+    settled = 0
+    start_id, goal_id = graph.id_of(start), graph.id_of(goal)
+    if start_id is None or goal_id is None:
+        if stats is not None:
+            stats['settled'] = settled
+        return ([start], 0) if start == goal else (None, None)
+    priority_queue = [(0, start_id)]
+    cost_so_far = {start_id: 0}
+    parent = {start_id: -1}
+    offsets, targets, weights = graph.offsets_view, graph.targets_view, graph.weights_view
+    while priority_queue:
+        current_cost, current_node = heapq.heappop(priority_queue)
+        if current_node == goal_id:
+            settled += 1
+            break
+        if current_cost > cost_so_far[current_node]:
+            continue
+        settled += 1
+        for i in range(offsets[current_node], offsets[current_node + 1]):
+            neighbor = targets[i]
+            new_cost = current_cost + (1 if weights is None else weights[i])
+            if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
+                cost_so_far[neighbor] = new_cost
+                parent[neighbor] = current_node
+                heapq.heappush(priority_queue, (new_cost, neighbor))
+    if stats is not None:
+        stats['settled'] = settled
+    if goal_id not in parent:
+        return None, None
+    return graph.path_labels(unroll_parents(parent, goal_id)), cost_so_far[goal_id]
+def bfs_csr(graph, start, goal):
+    start_id, goal_id = graph.id_of(start), graph.id_of(goal)
+    if start_id is None or goal_id is None:
+        return ([start], 0) if start == goal else (None, None)
+    queue = deque([start_id])
+    parent = {start_id: -1}
+    while queue:
+        current_node = queue.popleft()
+        if current_node == goal_id:
+            break
+        for neighbor in graph.neighbors(current_node):
+            if neighbor not in parent:
+                parent[neighbor] = current_node
+                queue.append(neighbor)
+    if goal_id not in parent:
+        return None, None
+    path = graph.path_labels(unroll_parents(parent, goal_id))
+    return path, len(path) - 1
+def unroll_parents(parent, node):
+    path = []
+    while node != -1:
+        path.append(node)
+        node = parent[node]
+    path.reverse()
+    return path
+def reverse_graph(graph):
+    if isinstance(graph, CSRGraph):
+        return graph.reverse()
+    reverse = {node: [] for node in graph}
+    for node in graph:
+        for neighbor, weight in graph[node]:
+            reverse.setdefault(neighbor, []).append((node, weight))
+    return reverse
+def bidirectional_uniform_cost_search(graph, start, goal, reverse=None):
+    if start == goal:
+        return [start], 0
+    if reverse is None:
+        reverse = reverse_graph(graph)
+    if isinstance(graph, CSRGraph):
+        start_id, goal_id = graph.id_of(start), graph.id_of(goal)
+        if start_id is None or goal_id is None:
+            return None, None
+        path, cost = bidirectional_search(graph.edges, reverse.edges, start_id, goal_id)
+        return (None, None) if path is None else (graph.path_labels(path), cost)
+    return bidirectional_search(lambda node: graph.get(node, []), lambda node: reverse.get(node, []), start, goal)
+def bidirectional_search(forward_edges, backward_edges, start, goal):
+    edges = (forward_edges, backward_edges)
+    priority_queues = ([(0, start)], [(0, goal)])
+    cost_so_far = ({start: 0}, {goal: 0})
+    parents = ({start: None}, {goal: None})
+    best_cost = None
+    meeting_node = None
+    while priority_queues[0] and priority_queues[1]:
+        # Once the two smallest keys add up to the best meeting cost, no shorter path can exist
+        if best_cost is not None and priority_queues[0][0][0] + priority_queues[1][0][0] >= best_cost:
+            break
+        side = 0 if priority_queues[0][0][0] <= priority_queues[1][0][0] else 1
+        queue, costs, parent, other_costs = priority_queues[side], cost_so_far[side], parents[side], cost_so_far[1 - side]
+        current_cost, current_node = heapq.heappop(queue)
+        if current_cost > costs[current_node]:
+            continue
+        for neighbor, edge_cost in edges[side](current_node):
+            new_cost = current_cost + edge_cost
+            if neighbor not in costs or new_cost < costs[neighbor]:
+                costs[neighbor] = new_cost
+                parent[neighbor] = current_node
+                heapq.heappush(queue, (new_cost, neighbor))
+                if neighbor in other_costs and (best_cost is None or new_cost + other_costs[neighbor] < best_cost):
+                    best_cost = new_cost + other_costs[neighbor]
+                    meeting_node = neighbor
+    if meeting_node is None:
+        return None, None
+    path = []
+    node = meeting_node
+    while node is not None:
+        path.append(node)
+        node = parents[0][node]
+    path.reverse()
+    node = parents[1][meeting_node]
+    while node is not None:
+        path.append(node)
+        node = parents[1][node]
+    return path, best_cost
+def nearest_targets(graph, start, goals, k=1, stats=None):
+    # One search for "which of these goals is closest": stops once k of them are settled
+    if isinstance(graph, CSRGraph):
+        source = graph.id_of(start)
+        targets = {graph.id_of(goal) for goal in goals} - {None}
+        edges, to_labels = graph.edges, graph.path_labels
+    else:
+        source, targets = start, set(goals)
+        edges, to_labels = (lambda node: graph.get(node, [])), (lambda path: path)
+    if source is None:
+        if stats is not None:
+            stats['settled'] = 0
+        return [(start, [start], 0)] if start in goals else []
+    settled = 0
+    found = []
+    priority_queue = [(0, source)]
+    cost_so_far = {source: 0}
+    parent = {source: None}
+    while priority_queue and len(found) < k:
+        current_cost, current_node = heapq.heappop(priority_queue)
+        if current_cost > cost_so_far[current_node]:
+            continue
+        settled += 1
+        if current_node in targets:
+            found.append(current_node)
+        for neighbor, edge_cost in edges(current_node):
+            new_cost = current_cost + edge_cost
+            if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
+                cost_so_far[neighbor] = new_cost
+                parent[neighbor] = current_node
+                heapq.heappush(priority_queue, (new_cost, neighbor))
+    if stats is not None:
+        stats['settled'] = settled
+    results = []
+    for target in found:
+        path = []
+        node = target
+        while node is not None:
+            path.append(node)
+            node = parent[node]
+        path.reverse()
+        path = to_labels(path)
+        results.append((path[-1], path, cost_so_far[target]))
+    return results
 def visualize_path(path, cost):
     if path is None:
         print("No path found.")
@@ -110,15 +352,41 @@ graph_unweighted = {
     'F': [('G', 1)],
     'G': []
 }
-print("Uniform Cost Search on Weighted Graph:")
-path_ucs_weighted, cost_ucs_weighted = uniform_cost_search(graph_weighted, start, goal)
-visualize_path(path_ucs_weighted, cost_ucs_weighted)
-visualize_graph(graph_weighted, path_ucs_weighted, "UCS on Weighted Graph")
-print("\nUniform Cost Search on Unweighted Graph (all weights=1):")
-path_ucs_unweighted, cost_ucs_unweighted = uniform_cost_search(graph_unweighted, start, goal)
-visualize_path(path_ucs_unweighted, cost_ucs_unweighted)
-visualize_graph(graph_unweighted, path_ucs_unweighted, "UCS on Unweighted Graph")
-print("\nBFS on Unweighted Graph (all weights=1):")
-path_bfs_unweighted, cost_bfs_unweighted = bfs(graph_unweighted, start, goal)
-visualize_path(path_bfs_unweighted, cost_bfs_unweighted)
-visualize_graph(graph_unweighted, path_bfs_unweighted, "BFS on Unweighted Graph")
\ No newline at end of file
+def main():
+    # --export: write the PNGs headless instead of opening windows
+    export = '--export' in sys.argv
+    argv = [arg for arg in sys.argv[1:] if arg != '--export']
+    if len(argv) > 2:
+        # python L81.py graph_file start goal, with "u v weight" lines; parsed once, then a cached snapshot
+        graph = load_graph(argv[0], weighted=True)
+        print("Uniform Cost Search on", graph)
+        path, cost = uniform_cost_search(graph, argv[1], argv[2])
+        visualize_path(path, cost)
+        print("\nBidirectional Uniform Cost Search on", graph)
+        visualize_path(*bidirectional_uniform_cost_search(graph, argv[1], argv[2]))
+        print("\nBFS on", graph)
+        visualize_path(*bfs(graph, argv[1], argv[2]))
+        if export:
+            # Large graphs are drawn as the path's neighborhood only
+            title = "UCS on " + os.path.splitext(os.path.basename(argv[0]))[0]
+            print("\nWrote", visualize_graph(graph, path, title, show=False))
+        return
+    print("Uniform Cost Search on Weighted Graph:")
+    path_ucs_weighted, cost_ucs_weighted = uniform_cost_search(graph_weighted, start, goal)
+    visualize_path(path_ucs_weighted, cost_ucs_weighted)
+    visualize_graph(graph_weighted, path_ucs_weighted, "UCS on Weighted Graph", show=not export)
+    print("\nBidirectional Uniform Cost Search on Weighted Graph:")
+    visualize_path(*bidirectional_uniform_cost_search(graph_weighted, start, goal))
+    print("\nUniform Cost Search on Unweighted Graph (all weights=1):")
+    path_ucs_unweighted, cost_ucs_unweighted = uniform_cost_search(graph_unweighted, start, goal)
+    visualize_path(path_ucs_unweighted, cost_ucs_unweighted)
+    visualize_graph(graph_unweighted, path_ucs_unweighted, "UCS on Unweighted Graph", show=not export)
+    print("\nNearest 2 of D, F, G from A on Weighted Graph:")
+    for target, path, cost in nearest_targets(graph_weighted, start, {'D', 'F', 'G'}, k=2):
+        print(target + ":", ' -> '.join(path), "(cost {})".format(cost))
+    print("\nBFS on Unweighted Graph (all weights=1):")
+    path_bfs_unweighted, cost_bfs_unweighted = bfs(graph_unweighted, start, goal)
+    visualize_path(path_bfs_unweighted, cost_bfs_unweighted)
+    visualize_graph(graph_unweighted, path_bfs_unweighted, "BFS on Unweighted Graph", show=not export)
+if __name__ == "__main__":
+    main()
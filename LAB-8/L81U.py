@@ -186,6 +186,156 @@ def bfs(graph, start, goal):
 
     return path, cost
 
+# Reverse graph: every edge u -> v (cost w) becomes v -> u (cost w)
+def reverse_graph(graph):
+    """
+    Parameters:
+    - graph: Dictionary representing the graph structure
+    Returns:
+    - reverse: Dictionary with the same nodes and every edge flipped
+    """
+    reverse = {node: [] for node in graph}
+    for node in graph:
+        for neighbor, weight in graph[node]:
+            reverse.setdefault(neighbor, []).append((node, weight))
+    return reverse
+
+
+# Bidirectional Uniform Cost Search (bidirectional Dijkstra)
+def bidirectional_uniform_cost_search(graph, start, goal, reverse=None):
+    """
+    Parameters:
+    - graph: Dictionary representing the graph structure
+    - start: Starting node
+    - goal: Target node
+    - reverse: Optional reversed graph (pass it in when running many queries)
+    Returns:
+    - path: List of nodes in the shortest path
+    - cost: Total cost of the path
+    """
+
+    if start == goal:
+        return [start], 0
+
+    # The backward search walks edges against their direction
+    if reverse is None:
+        reverse = reverse_graph(graph)
+    graphs = (graph, reverse)
+
+    # One priority queue, cost table and parent table per side (0 = forward, 1 = backward)
+    priority_queues = ([(0, start)], [(0, goal)])
+    cost_so_far = ({start: 0}, {goal: 0})
+    parents = ({start: None}, {goal: None})
+
+    best_cost = None  # Cheapest start -> goal cost seen through a node reached by both sides
+    meeting_node = None
+
+    while priority_queues[0] and priority_queues[1]:
+        # Any path not found yet costs at least the two smallest keys added together,
+        # so once that reaches best_cost the best meeting is proven optimal
+        if best_cost is not None and priority_queues[0][0][0] + priority_queues[1][0][0] >= best_cost:
+            break
+
+        # Expand the side whose next node is cheaper
+        side = 0 if priority_queues[0][0][0] <= priority_queues[1][0][0] else 1
+        queue = priority_queues[side]
+        costs = cost_so_far[side]
+        other_costs = cost_so_far[1 - side]
+
+        current_cost, current_node = heapq.heappop(queue)
+
+        # Skip if we've found a better path
+        if current_cost > costs[current_node]:
+            continue
+
+        for neighbor, edge_cost in graphs[side].get(current_node, []):
+            new_cost = current_cost + edge_cost
+
+            if neighbor not in costs or new_cost < costs[neighbor]:
+                costs[neighbor] = new_cost
+                parents[side][neighbor] = current_node
+                heapq.heappush(queue, (new_cost, neighbor))
+
+                # If the other side has reached this node too, the two halves form a path
+                if neighbor in other_costs and (best_cost is None or new_cost + other_costs[neighbor] < best_cost):
+                    best_cost = new_cost + other_costs[neighbor]
+                    meeting_node = neighbor
+
+    # If the two searches never met, there is no path
+    if meeting_node is None:
+        return None, None
+
+    # Forward half: meeting node back to start, then reversed
+    path = []
+    node = meeting_node
+    while node is not None:
+        path.append(node)
+        node = parents[0][node]
+    path.reverse()
+
+    # Backward half: meeting node's successors towards goal
+    node = parents[1][meeting_node]
+    while node is not None:
+        path.append(node)
+        node = parents[1][node]
+
+    return path, best_cost
+
+# Nearest-of-K targets: one Uniform Cost Search for many possible goals
+def nearest_targets(graph, start, goals, k=1, stats=None):
+    """
+    Parameters:
+    - graph: Dictionary representing the graph structure
+    - start: Starting node
+    - goals: Collection of possible target nodes (e.g. all depots)
+    - k: Stop once this many targets have been reached
+    - stats: Optional dictionary, receives the number of settled nodes
+    Returns:
+    - List of (target, path, cost) for the k nearest targets, cheapest first
+    """
+
+    targets = set(goals)
+    settled = 0
+    found = []
+
+    priority_queue = [(0, start)]
+    cost_so_far = {start: 0}
+    parent = {start: None}
+
+    while priority_queue and len(found) < k:
+        current_cost, current_node = heapq.heappop(priority_queue)
+
+        # Skip outdated queue entries
+        if current_cost > cost_so_far[current_node]:
+            continue
+        settled += 1
+
+        # Nodes leave the queue in order of cost, so the first targets settled are the nearest
+        if current_node in targets:
+            found.append(current_node)
+
+        for neighbor, edge_cost in graph.get(current_node, []):
+            new_cost = current_cost + edge_cost
+            if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
+                cost_so_far[neighbor] = new_cost
+                parent[neighbor] = current_node
+                heapq.heappush(priority_queue, (new_cost, neighbor))
+
+    if stats is not None:
+        stats['settled'] = settled
+
+    # Every target shares the same parent table, so each path is just walked back
+    results = []
+    for target in found:
+        path = []
+        node = target
+        while node is not None:
+            path.append(node)
+            node = parent[node]
+        path.reverse()
+        results.append((target, path, cost_so_far[target]))
+    return results
+
 def visualize_path(path, cost):
     """Simple helper function to print path and cost"""
     if path is None:
@@ -0,0 +1,131 @@
+import os
+import random
+import sys
+import time
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'LAB-5'))
+from csr_graph import CSRGraph
+from L81 import graph_weighted, uniform_cost_search, visualize_path
+from alt_search import grid_network
+
+
+# All-pairs distance oracle
+class DistanceOracle:
+    """
+    dist[i, j]: cost of the cheapest path from node i to node j (inf if there is none)
+    next_hop[i, j]: node after i on that path (-1 if there is none)
+
+    Built once with Floyd-Warshall, after which every lookup is a table read and a path
+    is unrolled in O(path length) by following next_hop.
+    """
+
+    def __init__(self, labels, dist, next_hop):
+        self.labels = list(labels)
+        self.index = {label: i for i, label in enumerate(self.labels)}
+        self.dist = dist
+        self.next_hop = next_hop
+
+    @classmethod
+    def build(cls, graph):
+        """
+        Parameters:
+        - graph: adjacency dict {node: [(neighbor, weight), ...]} or CSRGraph
+        Memory is n * n * 12 bytes (float64 + int32), so a few thousand nodes is the intended size.
+        """
+        if not isinstance(graph, CSRGraph):
+            graph = CSRGraph.from_adjacency(graph)
+        n = graph.num_nodes
+        dist = np.full((n, n), np.inf)
+        next_hop = np.full((n, n), -1, dtype=np.int32)
+        sources = np.repeat(np.arange(n), np.diff(graph.offsets))
+        targets = graph.targets
+        weights = graph.weights if graph.weighted else np.ones(graph.num_edges)
+        # Parallel edges: keep the cheapest
+        np.minimum.at(dist, (sources, targets), weights)
+        next_hop[sources, targets] = targets
+        nodes = np.arange(n)
+        dist[nodes, nodes] = 0
+        next_hop[nodes, nodes] = nodes
+
+        # Floyd-Warshall: allow node k as an intermediate, one whole n x n relaxation per k
+        through_k = np.empty_like(dist)
+        better = np.empty((n, n), dtype=bool)
+        for k in range(n):
+            np.add(dist[:, k, None], dist[k], out=through_k)
+            np.less(through_k, dist, out=better)
+            np.copyto(dist, through_k, where=better)
+            # i -> j now goes through k, so it starts the way i -> k does
+            np.copyto(next_hop, next_hop[:, k, None], where=better)
+        return cls(graph.labels, dist, next_hop)
+
+    def save(self, directory):
+        """Write dist.npy, next_hop.npy and labels.txt (one label per line, as str) into directory."""
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, 'dist.npy'), self.dist)
+        np.save(os.path.join(directory, 'next_hop.npy'), self.next_hop)
+        with open(os.path.join(directory, 'labels.txt'), 'w') as file:
+            file.write('\n'.join(str(label) for label in self.labels))
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """With mmap=True the matrices stay on disk and only the rows a lookup touches are read."""
+        mode = 'r' if mmap else None
+        dist = np.load(os.path.join(directory, 'dist.npy'), mmap_mode=mode)
+        next_hop = np.load(os.path.join(directory, 'next_hop.npy'), mmap_mode=mode)
+        with open(os.path.join(directory, 'labels.txt')) as file:
+            labels = file.read().split('\n')
+        return cls(labels, dist, next_hop)
+
+    def distance(self, start, goal):
+        """Cost of the cheapest start -> goal path, None if there is none."""
+        if start == goal:
+            return 0
+        start_id, goal_id = self.index.get(start), self.index.get(goal)
+        if start_id is None or goal_id is None:
+            return None
+        cost = self.dist[start_id, goal_id]
+        if cost == np.inf:
+            return None
+        return int(cost) if cost.is_integer() else float(cost)
+
+    def search(self, start, goal):
+        """(path, cost) like uniform_cost_search, read from the tables."""
+        cost = self.distance(start, goal)
+        if cost is None:
+            return None, None
+        if start == goal:
+            return [start], 0
+        node, goal_id = self.index[start], self.index[goal]
+        path = [node]
+        while node != goal_id:
+            node = int(self.next_hop[node, goal_id])
+            path.append(node)
+        return [self.labels[node] for node in path], cost
+
+
+def main():
+    oracle = DistanceOracle.build(graph_weighted)
+    print("All-pairs oracle on Weighted Graph:")
+    visualize_path(*oracle.search('A', 'G'))
+
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    graph = CSRGraph.from_adjacency(grid_network(size))
+    start_time = time.perf_counter()
+    oracle = DistanceOracle.build(graph)
+    print("\nBuilt {} x {} tables in {:.2f} s".format(graph.num_nodes, graph.num_nodes, time.perf_counter() - start_time))
+
+    rng = random.Random(1)
+    queries = [(rng.choice(graph.labels), rng.choice(graph.labels)) for _ in range(200)]
+    start_time = time.perf_counter()
+    ucs_costs = [uniform_cost_search(graph, start, goal)[1] for start, goal in queries]
+    ucs_time = (time.perf_counter() - start_time) / len(queries)
+    start_time = time.perf_counter()
+    oracle_costs = [oracle.search(start, goal)[1] for start, goal in queries]
+    oracle_time = (time.perf_counter() - start_time) / len(queries)
+    assert ucs_costs == oracle_costs
+    print("Per query  UCS: {:.1f} us  oracle: {:.1f} us".format(ucs_time * 1e6, oracle_time * 1e6))
+    print("UCS for all {} pairs would take about {:.0f} s".format(graph.num_nodes ** 2, ucs_time * graph.num_nodes ** 2))
+
+
+if __name__ == "__main__":
+    main()
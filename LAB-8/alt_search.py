@@ -0,0 +1,172 @@
+import heapq
+import os
+import random
+import sys
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'LAB-5'))
+from csr_graph import CSRGraph
+from L81 import graph_weighted, uniform_cost_search, visualize_path
+from shortest_path_tree import ShortestPathTree
+
+INFINITY = float('inf')
+
+
+def costs_from(graph, source):
+    """Cost from source to every node of a CSRGraph (inf if unreachable), as a numpy array."""
+    tree = ShortestPathTree(graph.edges, source)
+    tree.settle()
+    costs = np.full(graph.num_nodes, INFINITY)
+    costs[list(tree.cost_so_far)] = list(tree.cost_so_far.values())
+    return costs
+
+
+# ALT: A* with Landmarks and the Triangle inequality
+class LandmarkHeuristic:
+    """
+    For every landmark L we keep d(L, v) and d(v, L) for all nodes v. By the triangle
+    inequality, d(v, t) >= d(L, t) - d(L, v) and d(v, t) >= d(v, L) - d(t, L), so the
+    largest of these bounds is an admissible (and consistent) A* heuristic that needs
+    no coordinates, only the graph itself.
+    """
+
+    def __init__(self, graph, num_landmarks=8, seed=0):
+        if not isinstance(graph, CSRGraph):
+            graph = CSRGraph.from_adjacency(graph)
+        self.graph = graph
+        self.landmarks = []
+        self.from_landmark = []  # from_landmark[j][v] = d(landmark j, v)
+        self.to_landmark = []  # to_landmark[j][v] = d(v, landmark j)
+        self.select_landmarks(min(num_landmarks, graph.num_nodes), seed)
+
+    def select_landmarks(self, num_landmarks, seed):
+        """Farthest-point selection: each new landmark is the node farthest from all landmarks so far."""
+        if num_landmarks == 0:
+            return
+        reverse = self.graph.reverse()
+        # Start from the node farthest from a random node, which lands on the edge of the graph
+        first = costs_from(self.graph, random.Random(seed).randrange(self.graph.num_nodes))
+        candidate = int(np.argmax(np.where(np.isinf(first), -1, first)))
+        nearest = np.full(self.graph.num_nodes, INFINITY)
+        while len(self.landmarks) < num_landmarks:
+            self.landmarks.append(candidate)
+            self.from_landmark.append(costs_from(self.graph, candidate))
+            self.to_landmark.append(costs_from(reverse, candidate))
+            np.minimum(nearest, self.from_landmark[-1] + self.to_landmark[-1], out=nearest)
+            nearest[self.landmarks] = -1
+            # Nodes no landmark reaches count as farthest, so other components get a landmark too
+            candidate = int(np.argmax(nearest))
+            if nearest[candidate] < 0:
+                break
+        self.from_landmark = np.array(self.from_landmark)
+        self.to_landmark = np.array(self.to_landmark)
+
+    def for_query(self, start, goal, active=4):
+        """
+        h(v) towards goal. Only the `active` landmarks giving the best bound at start are used,
+        which keeps each evaluation cheap.
+        """
+        terms = [(memoryview(self.from_landmark[j]), float(self.from_landmark[j, goal]),
+                  memoryview(self.to_landmark[j]), float(self.to_landmark[j, goal]))
+                 for j in range(len(self.landmarks))]
+
+        def start_bound(term):
+            from_l, from_l_goal, to_l, to_l_goal = term
+            # An infinite (or inf - inf = nan) term carries no usable bound
+            bounds = [lower for lower in (from_l_goal - from_l[start], to_l[start] - to_l_goal) if lower < INFINITY]
+            return max(bounds, default=0)
+
+        terms.sort(key=start_bound, reverse=True)
+        del terms[active:]
+
+        def heuristic(v):
+            best = 0
+            for from_l, from_l_goal, to_l, to_l_goal in terms:
+                lower = from_l_goal - from_l[v]
+                if best < lower < INFINITY:
+                    best = lower
+                lower = to_l[v] - to_l_goal
+                if best < lower < INFINITY:
+                    best = lower
+            return best
+
+        return heuristic
+
+    def search(self, start, goal, stats=None):
+        """A* over the same adjacency list; returns (path, cost) like uniform_cost_search."""
+        graph = self.graph
+        settled = 0
+        start_id, goal_id = graph.id_of(start), graph.id_of(goal)
+        if start_id is None or goal_id is None:
+            if stats is not None:
+                stats['settled'] = settled
+            return ([start], 0) if start == goal else (None, None)
+        heuristic = self.for_query(start_id, goal_id)
+        priority_queue = [(heuristic(start_id), 0, start_id)]
+        cost_so_far = {start_id: 0}
+        parent = {start_id: None}
+        while priority_queue:
+            _, current_cost, current_node = heapq.heappop(priority_queue)
+            if current_node == goal_id:
+                settled += 1
+                break
+            if current_cost > cost_so_far[current_node]:
+                continue
+            settled += 1
+            for neighbor, edge_cost in graph.edges(current_node):
+                new_cost = current_cost + edge_cost
+                if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
+                    cost_so_far[neighbor] = new_cost
+                    parent[neighbor] = current_node
+                    heapq.heappush(priority_queue, (new_cost + heuristic(neighbor), new_cost, neighbor))
+        if stats is not None:
+            stats['settled'] = settled
+        if goal_id not in parent:
+            return None, None
+        path = []
+        node = goal_id
+        while node is not None:
+            path.append(node)
+            node = parent[node]
+        path.reverse()
+        return graph.path_labels(path), cost_so_far[goal_id]
+
+
+def grid_network(size, seed=0):
+    """Road-like test network: size x size grid, two-way streets with random travel costs."""
+    rng = random.Random(seed)
+    graph = {(row, col): [] for row in range(size) for col in range(size)}
+    for row in range(size):
+        for col in range(size):
+            for next_node in ((row + 1, col), (row, col + 1)):
+                if next_node in graph:
+                    cost = rng.randint(1, 10)
+                    graph[(row, col)].append((next_node, cost))
+                    graph[next_node].append(((row, col), cost))
+    return graph
+
+
+def main():
+    alt = LandmarkHeuristic(graph_weighted, num_landmarks=2)
+    print("ALT on Weighted Graph:")
+    visualize_path(*alt.search('A', 'G'))
+
+    graph = CSRGraph.from_adjacency(grid_network(100))
+    alt = LandmarkHeuristic(graph, num_landmarks=8)
+    rng = random.Random(1)
+    queries = [(rng.choice(graph.labels), rng.choice(graph.labels)) for _ in range(50)]
+    ucs_settled = alt_settled = 0
+    for start, goal in queries:
+        ucs_stats, alt_stats = {}, {}
+        _, ucs_cost = uniform_cost_search(graph, start, goal, ucs_stats)
+        _, alt_cost = alt.search(start, goal, alt_stats)
+        assert ucs_cost == alt_cost
+        ucs_settled += ucs_stats['settled']
+        alt_settled += alt_stats['settled']
+    print("\n{} queries on a {} node grid network, landmarks {}".format(
+        len(queries), graph.num_nodes, graph.path_labels(alt.landmarks)))
+    print("Settled nodes  UCS: {}  ALT: {}  ({:.1f}x fewer)".format(
+        ucs_settled, alt_settled, ucs_settled / max(alt_settled, 1)))
+
+
+if __name__ == "__main__":
+    main()
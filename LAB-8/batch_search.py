@@ -0,0 +1,101 @@
+import os
+import random
+import sys
+import time
+from multiprocessing import Pool
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'LAB-5'))
+from graph_io import load_snapshot
+from L81 import (bfs, bidirectional_uniform_cost_search, graph_weighted, reverse_graph,
+                 uniform_cost_search, visualize_path)
+
+ALGORITHMS = ('ucs', 'bfs', 'bidirectional')
+
+# Per-process state, set once by init_worker
+worker_graph = None
+worker_reverse = None
+worker_algorithm = None
+
+
+def init_worker(graph, algorithm):
+    """Runs once in every worker: receives the graph (or opens the snapshot) and keeps it for all its queries."""
+    global worker_graph, worker_reverse, worker_algorithm
+    worker_graph = load_snapshot(graph) if isinstance(graph, str) else graph
+    worker_reverse = reverse_graph(worker_graph) if algorithm == 'bidirectional' else None
+    worker_algorithm = algorithm
+
+
+def run_query(query):
+    start, goal = query
+    if worker_algorithm == 'bfs':
+        return bfs(worker_graph, start, goal)
+    if worker_algorithm == 'bidirectional':
+        return bidirectional_uniform_cost_search(worker_graph, start, goal, worker_reverse)
+    return uniform_cost_search(worker_graph, start, goal)
+
+
+# Batch route queries
+def batch_search(graph, queries, algorithm='ucs', processes=None, chunksize=None):
+    """
+    Parameters:
+    - graph: adjacency dict, CSRGraph, or the path of a graph_io snapshot. A snapshot path is the cheapest way
+      to share a big graph: every worker memory-maps the same file instead of receiving a pickled copy.
+    - queries: iterable of (start, goal) pairs
+    - algorithm: 'ucs', 'bfs' or 'bidirectional'
+    - processes: number of worker processes (default: all cores); 1 runs in this process
+    - chunksize: queries sent to a worker at a time (default: about 4 chunks per worker)
+    Returns:
+    - an iterator of (path, cost) for each query, in the order of queries, each as soon as it is available
+
+    Arguments are checked here, so a bad algorithm raises right away rather than on the first next().
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError("algorithm must be one of {}, got {!r}".format(ALGORITHMS, algorithm))
+    processes = processes or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, len(queries) // (processes * 4)) if hasattr(queries, '__len__') else 64
+    return run_batch(graph, queries, algorithm, processes, chunksize)
+
+
+def run_batch(graph, queries, algorithm, processes, chunksize):
+    if processes == 1:
+        try:
+            init_worker(graph, algorithm)
+            yield from map(run_query, queries)
+        finally:
+            # This process is not a throwaway worker: drop the graph once the batch is done
+            init_worker(None, None)
+        return
+    with Pool(processes, initializer=init_worker, initargs=(graph, algorithm)) as pool:
+        yield from pool.imap(run_query, queries, chunksize)
+
+
+def random_graph(num_nodes, degree, max_weight=10, seed=0):
+    rng = random.Random(seed)
+    nodes = [str(i) for i in range(num_nodes)]
+    return {node: [(rng.choice(nodes), rng.randint(1, max_weight)) for _ in range(degree)] for node in nodes}
+
+
+def main():
+    queries = [('A', goal) for goal in 'ABCDEFG']
+    for (start, goal), (path, cost) in zip(queries, batch_search(graph_weighted, queries, processes=2)):
+        print("{} -> {}:".format(start, goal))
+        visualize_path(path, cost)
+
+    # Throughput from 1 core up to all cores on a larger random graph
+    graph = random_graph(5000, 4)
+    rng = random.Random(1)
+    queries = [(rng.choice(list(graph)), rng.choice(list(graph))) for _ in range(200)]
+    print("\nBatch of {} queries, {} nodes:".format(len(queries), len(graph)))
+    baseline = None
+    processes = 1
+    while processes <= (os.cpu_count() or 1):
+        start_time = time.perf_counter()
+        list(batch_search(graph, queries, processes=processes))
+        elapsed = time.perf_counter() - start_time
+        baseline = baseline or elapsed
+        print("{:3d} processes: {:7.2f} s  speedup {:5.2f}x".format(processes, elapsed, baseline / elapsed))
+        processes *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+import heapq
+import os
+import sys
+import time
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'LAB-5'))
+from csr_graph import CSRGraph
+from graph_io import load_graph
+from L81 import graph_weighted, uniform_cost_search, visualize_path
+
+INFINITY = float('inf')
+
+
+# Contraction hierarchy over a static weighted graph
+class ContractionHierarchy:
+    """
+    Nodes are contracted one at a time (cheapest edge difference first). Contracting v
+    adds a shortcut u -> x (cost w1 + w2) whenever u -> v -> x is the only shortest way
+    from u to x among the nodes still left. A query is then a bidirectional search that
+    only goes up in rank, so it settles a handful of nodes instead of half the network.
+
+    up: CSRGraph with node v -> x for every edge where rank[x] > rank[v]
+    down: CSRGraph with node v -> u for every edge u -> v where rank[u] > rank[v]
+    up_middle/down_middle: contracted node a shortcut skips, or -1 for an original edge
+    """
+
+    def __init__(self, labels, rank, up, up_middle, down, down_middle):
+        self.labels = labels
+        self.rank = np.asarray(rank, dtype=np.int32)
+        self.up = up
+        self.down = down
+        self.up_middle = np.asarray(up_middle, dtype=np.int32)
+        self.down_middle = np.asarray(down_middle, dtype=np.int32)
+        self.index = up.index
+
+    @classmethod
+    def build(cls, graph, settle_limit=200):
+        """
+        Parameters:
+        - graph: adjacency dict {node: [(neighbor, weight), ...]} (like graph_weighted) or CSRGraph
+        - settle_limit: nodes a witness search may settle; lower is faster but adds extra shortcuts
+        """
+        if not isinstance(graph, CSRGraph):
+            graph = CSRGraph.from_adjacency(graph)
+        n = graph.num_nodes
+        # Remaining graph: out_edges[u][x] = in_edges[x][u] = (cost, middle)
+        out_edges = [{} for _ in range(n)]
+        in_edges = [{} for _ in range(n)]
+        for u in range(n):
+            for x, weight in graph.edges(u):
+                if x != u and (x not in out_edges[u] or weight < out_edges[u][x][0]):
+                    out_edges[u][x] = in_edges[x][u] = (weight, -1)
+
+        def witness_costs(source, skipped, max_cost, targets):
+            # Bounded Dijkstra from source that avoids the node being contracted
+            cost_so_far = {source: 0}
+            priority_queue = [(0, source)]
+            remaining = set(targets)
+            settled = 0
+            while priority_queue and remaining and settled < settle_limit:
+                current_cost, current_node = heapq.heappop(priority_queue)
+                if current_cost > cost_so_far[current_node]:
+                    continue
+                if current_cost > max_cost:
+                    break
+                settled += 1
+                remaining.discard(current_node)
+                for neighbor, (edge_cost, _) in out_edges[current_node].items():
+                    new_cost = current_cost + edge_cost
+                    if neighbor != skipped and new_cost < cost_so_far.get(neighbor, INFINITY):
+                        cost_so_far[neighbor] = new_cost
+                        heapq.heappush(priority_queue, (new_cost, neighbor))
+            return cost_so_far
+
+        def shortcuts_for(v):
+            shortcuts = []
+            outgoing = [(x, weight) for x, (weight, _) in out_edges[v].items()]
+            for u, (in_cost, _) in in_edges[v].items():
+                targets = [(x, out_cost) for x, out_cost in outgoing if x != u]
+                if not targets:
+                    continue
+                max_cost = in_cost + max(out_cost for _, out_cost in targets)
+                cost_so_far = witness_costs(u, v, max_cost, [x for x, _ in targets])
+                for x, out_cost in targets:
+                    if cost_so_far.get(x, INFINITY) > in_cost + out_cost:
+                        shortcuts.append((u, x, in_cost + out_cost))
+            return shortcuts
+
+        contracted_neighbors = [0] * n
+
+        def priority(v, shortcuts):
+            return len(shortcuts) - len(in_edges[v]) - len(out_edges[v]) + contracted_neighbors[v]
+
+        queue = [(priority(v, shortcuts_for(v)), v) for v in range(n)]
+        heapq.heapify(queue)
+        rank = [0] * n
+        up_edges = [None] * n
+        down_edges = [None] * n
+        order = 0
+        while queue:
+            _, v = heapq.heappop(queue)
+            # Lazy update: the stored priority may be stale, recompute before contracting
+            shortcuts = shortcuts_for(v)
+            current_priority = priority(v, shortcuts)
+            if queue and current_priority > queue[0][0]:
+                heapq.heappush(queue, (current_priority, v))
+                continue
+
+            rank[v] = order
+            order += 1
+            # Everything still attached to v has a higher rank
+            up_edges[v] = list(out_edges[v].items())
+            down_edges[v] = list(in_edges[v].items())
+            for x in out_edges[v]:
+                del in_edges[x][v]
+                contracted_neighbors[x] += 1
+            for u in in_edges[v]:
+                del out_edges[u][v]
+                contracted_neighbors[u] += 1
+            for u, x, cost in shortcuts:
+                if x not in out_edges[u] or cost < out_edges[u][x][0]:
+                    out_edges[u][x] = in_edges[x][u] = (cost, v)
+
+        up, up_middle = cls.edges_to_csr(graph, up_edges)
+        down, down_middle = cls.edges_to_csr(graph, down_edges)
+        return cls(graph.labels, rank, up, up_middle, down, down_middle)
+
+    @staticmethod
+    def edges_to_csr(graph, edge_lists):
+        offsets = np.zeros(len(edge_lists) + 1, dtype=np.int64)
+        np.cumsum([len(edges) for edges in edge_lists], out=offsets[1:])
+        targets = [x for edges in edge_lists for x, _ in edges]
+        weights = np.array([cost for edges in edge_lists for _, (cost, _) in edges],
+                           dtype=graph.weights.dtype if graph.weighted else np.int64)
+        middle = [m for edges in edge_lists for _, (_, m) in edges]
+        return CSRGraph(graph.labels, offsets, targets, weights, graph.index), middle
+
+    def save(self, path):
+        """Write the hierarchy to an .npz file. Labels are stored as str."""
+        np.savez(path, labels=np.array([str(label) for label in self.labels]), rank=self.rank,
+                 up_offsets=self.up.offsets, up_targets=self.up.targets, up_weights=self.up.weights,
+                 up_middle=self.up_middle, down_offsets=self.down.offsets, down_targets=self.down.targets,
+                 down_weights=self.down.weights, down_middle=self.down_middle)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            labels = data['labels'].tolist()
+            up = CSRGraph(labels, data['up_offsets'], data['up_targets'], data['up_weights'])
+            down = CSRGraph(labels, data['down_offsets'], data['down_targets'], data['down_weights'], up.index)
+            return cls(labels, data['rank'], up, data['up_middle'], down, data['down_middle'])
+
+    def query(self, start, goal, unpack=False):
+        """
+        Cost of the cheapest start -> goal path (None if there is none).
+        With unpack=True returns (path, cost) like uniform_cost_search, shortcuts expanded to original nodes.
+        """
+        if start == goal:
+            return ([start], 0) if unpack else 0
+        start_id, goal_id = self.index.get(start), self.index.get(goal)
+        if start_id is None or goal_id is None:
+            return (None, None) if unpack else None
+
+        graphs = (self.up, self.down)
+        priority_queues = ([(0, start_id)], [(0, goal_id)])
+        cost_so_far = ({start_id: 0}, {goal_id: 0})
+        parents = ({start_id: -1}, {goal_id: -1})
+        best_cost = INFINITY
+        meeting_node = -1
+        while True:
+            # Both sides only go up, so once the smallest key reaches the best meeting cost nothing can improve it
+            forward_key = priority_queues[0][0][0] if priority_queues[0] else INFINITY
+            backward_key = priority_queues[1][0][0] if priority_queues[1] else INFINITY
+            if min(forward_key, backward_key) >= best_cost:
+                break
+            side = 0 if forward_key <= backward_key else 1
+            current_cost, current_node = heapq.heappop(priority_queues[side])
+            costs, other_costs = cost_so_far[side], cost_so_far[1 - side]
+            if current_cost > costs[current_node]:
+                continue
+            if current_node in other_costs and current_cost + other_costs[current_node] < best_cost:
+                best_cost = current_cost + other_costs[current_node]
+                meeting_node = current_node
+            for neighbor, edge_cost in graphs[side].edges(current_node):
+                new_cost = current_cost + edge_cost
+                if neighbor not in costs or new_cost < costs[neighbor]:
+                    costs[neighbor] = new_cost
+                    parents[side][neighbor] = current_node
+                    heapq.heappush(priority_queues[side], (new_cost, neighbor))
+
+        if meeting_node == -1:
+            return (None, None) if unpack else None
+        if not unpack:
+            return best_cost
+
+        # Path in the hierarchy: start ... meeting node ... goal
+        hierarchy_path = []
+        node = meeting_node
+        while node != -1:
+            hierarchy_path.append(node)
+            node = parents[0][node]
+        hierarchy_path.reverse()
+        node = parents[1][meeting_node]
+        while node != -1:
+            hierarchy_path.append(node)
+            node = parents[1][node]
+
+        path = [hierarchy_path[0]]
+        for u, x in zip(hierarchy_path, hierarchy_path[1:]):
+            path.extend(self.unpack_edge(u, x))
+        return [self.labels[node] for node in path], best_cost
+
+    def middle_of(self, u, x):
+        # Edge u -> x lives in up (at u) if x ranks higher, otherwise in down (at x)
+        if self.rank[x] > self.rank[u]:
+            graph, middle, node, other = self.up, self.up_middle, u, x
+        else:
+            graph, middle, node, other = self.down, self.down_middle, x, u
+        for i in range(graph.offsets_view[node], graph.offsets_view[node + 1]):
+            if graph.targets_view[i] == other:
+                return int(middle[i])
+        raise KeyError("no edge {} -> {} in the hierarchy".format(self.labels[u], self.labels[x]))
+
+    def unpack_edge(self, u, x):
+        """Original nodes after u on the edge u -> x, shortcuts expanded recursively (iteratively here)."""
+        nodes = []
+        stack = [(u, x)]
+        while stack:
+            a, b = stack.pop()
+            middle = self.middle_of(a, b)
+            if middle == -1:
+                nodes.append(b)
+            else:
+                stack.append((middle, b))
+                stack.append((a, middle))
+        return nodes
+
+
+# Usage:
+#   python contraction_hierarchy.py build weighted.txt network.npz
+#   python contraction_hierarchy.py query network.npz start goal
+def main():
+    if len(sys.argv) == 4 and sys.argv[1] == 'build':
+        start_time = time.perf_counter()
+        hierarchy = ContractionHierarchy.build(load_graph(sys.argv[2], weighted=True))
+        hierarchy.save(sys.argv[3])
+        print("Built {} in {:.2f} s ({} up edges, {} down edges)".format(
+            sys.argv[3], time.perf_counter() - start_time, hierarchy.up.num_edges, hierarchy.down.num_edges))
+        return
+    if len(sys.argv) == 5 and sys.argv[1] == 'query':
+        hierarchy = ContractionHierarchy.load(sys.argv[2])
+        start_time = time.perf_counter()
+        path, cost = hierarchy.query(sys.argv[3], sys.argv[4], unpack=True)
+        print("Query took {:.1f} us".format((time.perf_counter() - start_time) * 1e6))
+        visualize_path(path, cost)
+        return
+
+    hierarchy = ContractionHierarchy.build(graph_weighted)
+    print("Contraction Hierarchy on Weighted Graph:")
+    print("Cost A -> G:", hierarchy.query('A', 'G'))
+    visualize_path(*hierarchy.query('A', 'G', unpack=True))
+    print("\nUniform Cost Search on Weighted Graph:")
+    visualize_path(*uniform_cost_search(graph_weighted, 'A', 'G'))
+
+
+if __name__ == "__main__":
+    main()
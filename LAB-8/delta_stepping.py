@@ -0,0 +1,177 @@
+import os
+import sys
+import time
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'LAB-5'))
+from csr_graph import CSRGraph
+from direction_optimizing_bfs import gather_edges
+from graph_io import build_csr
+from L81 import graph_weighted
+import shared_arrays
+from shared_arrays import shared_pool
+from shortest_path_tree import ShortestPathTree
+
+# Below this many frontier nodes, shipping the work to the pool costs more than doing it here
+PARALLEL_THRESHOLD = 2048
+
+
+def relax_requests(nodes, light, delta, offsets, targets, weights, dist):
+    """
+    Relaxations out of nodes along light (weight <= delta) or heavy edges that would improve
+    the current cost, as arrays (neighbor, new cost, from node). Only reads shared state.
+    """
+    positions, owners = gather_edges(offsets, nodes)
+    edge_weights = weights[positions]
+    keep = edge_weights <= delta if light else edge_weights > delta
+    positions, owners, edge_weights = positions[keep], owners[keep], edge_weights[keep]
+    neighbors = targets[positions]
+    new_costs = dist[owners] + edge_weights
+    better = new_costs < dist[neighbors]
+    return neighbors[better], new_costs[better], owners[better]
+
+
+def run_requests(task):
+    nodes, light, delta = task
+    return relax_requests(nodes, light, delta, *shared_arrays.worker_arrays)
+
+
+# Delta-stepping single-source shortest paths (Meyer & Sanders)
+def delta_stepping_arrays(graph, source_id, delta=None, processes=None):
+    """
+    Parameters:
+    - graph: CSRGraph with non-negative weights (unweighted graphs count every edge as 1)
+    - source_id: source node id
+    - delta: bucket width > 0 (default: mean edge weight, 1.0 if every weight is 0)
+    - processes: worker processes generating relaxations (default: all cores); 1 runs in this process
+    Returns:
+    - dist: float64 array of costs, inf for unreachable nodes
+    - parent: int32 array, parent[source] = source and -1 for unreachable nodes
+
+    Nodes are kept in buckets of width delta. The whole lowest bucket is expanded at once
+    along its light edges (repeatedly, since light edges can refill the same bucket) and
+    then once along its heavy edges. Each expansion is split across workers that read the
+    CSR and cost arrays from shared memory; the main process merges their requests.
+    """
+    n = graph.num_nodes
+    weights = graph.weights if graph.weighted else np.ones(graph.num_edges)
+    weights = weights.astype(np.float64)
+    if len(weights) and weights.min() < 0:
+        raise ValueError("delta-stepping needs non-negative edge weights")
+    if delta is None:
+        delta = float(weights.mean()) if len(weights) else 1.0
+        if delta == 0:
+            # Weights are non-negative, so a zero mean means all are 0: any positive width works
+            delta = 1.0
+    if delta <= 0:
+        raise ValueError("delta must be positive, got {}".format(delta))
+    processes = processes or os.cpu_count() or 1
+
+    with shared_pool([graph.offsets, graph.targets, weights, np.full(n, np.inf)], processes) as (arrays, pool):
+        offsets, targets, weights, dist = arrays
+        parent = np.full(n, -1, dtype=np.int32)
+        # pending: improved since it was last taken out of a bucket
+        pending = np.zeros(n, dtype=bool)
+        dist[source_id] = 0
+        parent[source_id] = source_id
+        pending[source_id] = True
+
+        def requests_for(nodes, light):
+            if pool is None or len(nodes) < PARALLEL_THRESHOLD:
+                return relax_requests(nodes, light, delta, offsets, targets, weights, dist)
+            chunks = np.array_split(nodes, processes)
+            results = pool.map(run_requests, [(chunk, light, delta) for chunk in chunks])
+            return tuple(np.concatenate(parts) for parts in zip(*results))
+
+        def apply(neighbors, new_costs, owners):
+            # Several requests may target one node: the cheapest wins
+            order = np.lexsort((new_costs, neighbors))
+            neighbors, new_costs, owners = neighbors[order], new_costs[order], owners[order]
+            first = np.ones(len(neighbors), dtype=bool)
+            first[1:] = neighbors[1:] != neighbors[:-1]
+            neighbors, new_costs, owners = neighbors[first], new_costs[first], owners[first]
+            dist[neighbors] = new_costs
+            parent[neighbors] = owners
+            pending[neighbors] = True
+            return neighbors
+
+        while pending.any():
+            candidates = np.flatnonzero(pending)
+            buckets = np.floor(dist[candidates] / delta)
+            bucket = buckets.min()
+            frontier = candidates[buckets == bucket]
+            removed = []
+            while len(frontier):
+                pending[frontier] = False
+                removed.append(frontier)
+                improved = apply(*requests_for(frontier, light=True))
+                frontier = improved[np.floor(dist[improved] / delta) == bucket]
+            # Heavy edges can only reach later buckets, so one pass over the emptied bucket is enough
+            if removed:
+                apply(*requests_for(np.unique(np.concatenate(removed)), light=False))
+        return dist.copy(), parent
+
+
+def delta_stepping(graph, source, delta=None, processes=None):
+    """
+    Every node's cost from source and its parent on the cheapest path, as the cost_so_far and
+    parent dicts of uniform_cost_search (keyed by label, parent[source] = None, unreachable nodes left out).
+    """
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_adjacency(graph)
+    source_id = graph.id_of(source)
+    if source_id is None:
+        return {source: 0}, {source: None}
+    dist, parent = delta_stepping_arrays(graph, source_id, delta, processes)
+    integral = not graph.weighted or np.issubdtype(graph.weights.dtype, np.integer)
+    labels = graph.labels
+    reached = np.flatnonzero(parent != -1)
+    costs = dist[reached].astype(np.int64) if integral else dist[reached]
+    cost_so_far = dict(zip((labels[node] for node in reached.tolist()), costs.tolist()))
+    parent_labels = {labels[node]: (None if p == node else labels[p])
+                     for node, p in zip(reached.tolist(), parent[reached].tolist())}
+    return cost_so_far, parent_labels
+
+
+def random_weighted_graph(num_nodes, degree, max_weight=100, seed=0):
+    """Large random directed graph with integer weights as a CSRGraph."""
+    rng = np.random.default_rng(seed)
+    sources = rng.integers(0, num_nodes, num_nodes * degree, dtype=np.int32)
+    targets = rng.integers(0, num_nodes, num_nodes * degree, dtype=np.int32)
+    weights = rng.integers(1, max_weight + 1, num_nodes * degree, dtype=np.int32)
+    return build_csr([str(i) for i in range(num_nodes)], sources, targets, weights, weight_dtype=np.int32)
+
+
+def main():
+    cost_so_far, parent = delta_stepping(graph_weighted, 'A', processes=1)
+    print("Delta-stepping from A on Weighted Graph:")
+    for node in sorted(cost_so_far):
+        print("  {}: cost {}, parent {}".format(node, cost_so_far[node], parent[node]))
+    # Zero-weight edges are valid; the default bucket width falls back to a positive value
+    free_graph = {'A': [('B', 0), ('C', 2)], 'B': [('C', 0)], 'C': []}
+    cost_so_far, parent = delta_stepping(free_graph, 'A', processes=1)
+    print("With zero-weight edges: {}".format(cost_so_far))
+
+    num_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    graph = random_weighted_graph(num_nodes, 8)
+    print("\nGraph: {} nodes, {} edges".format(graph.num_nodes, graph.num_edges))
+    start_time = time.perf_counter()
+    tree = ShortestPathTree(graph.edges, 0)
+    tree.settle()
+    print("heap search (uniform cost):  {:7.3f} s".format(time.perf_counter() - start_time))
+
+    baseline = None
+    processes = 1
+    while True:
+        start_time = time.perf_counter()
+        dist, _ = delta_stepping_arrays(graph, 0, processes=processes)
+        elapsed = time.perf_counter() - start_time
+        baseline = baseline or elapsed
+        assert all(dist[node] == cost for node, cost in tree.cost_so_far.items())
+        print("delta-stepping, {:>2} process(es): {:7.3f} s  ({:.2f}x)".format(processes, elapsed, baseline / elapsed))
+        if processes >= (os.cpu_count() or 1):
+            break
+        processes = min(processes * 2, os.cpu_count())
+
+
+if __name__ == "__main__":
+    main()
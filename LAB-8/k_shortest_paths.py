@@ -0,0 +1,136 @@
+import heapq
+import itertools
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'LAB-5'))
+from csr_graph import CSRGraph
+from L81 import graph_weighted, reverse_graph, visualize_path
+from shortest_path_tree import ShortestPathTree
+
+
+# Yen's k shortest loopless paths
+def k_shortest_paths(graph, start, goal, k=None, stats=None):
+    """
+    Parameters:
+    - graph: adjacency dict {node: [(neighbor, weight), ...]} or CSRGraph
+    - start, goal: end points
+    - k: stop after k paths, none for k <= 0 (default: keep going until there are no more loopless paths)
+    - stats: optional dict, counts 'spur_searches' run and 'spur_reused' (answered from the tree)
+    Yields:
+    - (path, cost) in order of increasing cost, so callers can stop early
+
+    One reverse shortest-path tree from goal serves the whole run: it gives the first path,
+    it answers any spur whose tree path avoids the removed nodes and edges, and its
+    distances are an admissible A* heuristic for the spur searches that remain (removing
+    nodes and edges never makes the distance to goal shorter). Spurs are only taken from
+    the node where a path left its parent path onwards (Lawler), so no spur is recomputed.
+    """
+    counts = stats if stats is not None else {}
+    counts.update(spur_searches=0, spur_reused=0)
+    if k is not None and k <= 0:
+        return
+    if isinstance(graph, CSRGraph):
+        source, target = graph.id_of(start), graph.id_of(goal)
+        if source is None or target is None:
+            if start == goal:
+                yield [start], 0
+            return
+        edges, to_labels = graph.edges, graph.path_labels
+    else:
+        source, target = start, goal
+        edges, to_labels = (lambda node: graph.get(node, [])), (lambda path: path)
+    if source == target:
+        yield [start], 0
+        return
+
+    reverse = reverse_graph(graph)
+    reverse_edges = reverse.edges if isinstance(graph, CSRGraph) else (lambda node: reverse.get(node, []))
+    tree = ShortestPathTree(reverse_edges, target)
+    tree.settle()
+    to_goal, next_hop = tree.cost_so_far, tree.parent
+    if source not in to_goal:
+        return
+
+    def tree_path(node):
+        path = [node]
+        while path[-1] != target:
+            path.append(next_hop[path[-1]])
+        return path
+
+    def spur_path(spur, removed_nodes, removed_next):
+        """Cheapest spur -> goal path avoiding removed_nodes and the edges spur -> removed_next."""
+        path = tree_path(spur)
+        if next_hop[spur] not in removed_next and removed_nodes.isdisjoint(path):
+            counts['spur_reused'] += 1
+            return path, [to_goal[spur] - to_goal[node] for node in path]
+        counts['spur_searches'] += 1
+        # A* with the exact full-graph distance to goal as the heuristic
+        priority_queue = [(to_goal[spur], 0, spur)]
+        cost_so_far = {spur: 0}
+        parent = {spur: None}
+        while priority_queue:
+            _, current_cost, current_node = heapq.heappop(priority_queue)
+            if current_node == target:
+                break
+            if current_cost > cost_so_far[current_node]:
+                continue
+            for neighbor, edge_cost in edges(current_node):
+                if neighbor in removed_nodes or neighbor not in to_goal:
+                    continue
+                if current_node == spur and neighbor in removed_next:
+                    continue
+                new_cost = current_cost + edge_cost
+                if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
+                    cost_so_far[neighbor] = new_cost
+                    parent[neighbor] = current_node
+                    heapq.heappush(priority_queue, (new_cost + to_goal[neighbor], new_cost, neighbor))
+        if target not in parent:
+            return None, None
+        path = []
+        node = target
+        while node is not None:
+            path.append(node)
+            node = parent[node]
+        path.reverse()
+        return path, [cost_so_far[node] for node in path]
+
+    # Each found path: (nodes, cumulative cost at every node, index where it deviates from its parent path)
+    first = tree_path(source)
+    found = [(first, [to_goal[source] - to_goal[node] for node in first], 0)]
+    seen = {tuple(first)}
+    candidates = []
+    tie_breaker = itertools.count()
+    yield to_labels(first), to_goal[source]
+
+    while k is None or len(found) < k:
+        path, cumulative, deviation = found[-1]
+        for i in range(deviation, len(path) - 1):
+            root = path[:i + 1]
+            # Edges leaving the spur node along any found path with this same root
+            removed_next = {other[i + 1] for other, _, _ in found if len(other) > i + 1 and other[:i + 1] == root}
+            spur, spur_cumulative = spur_path(path[i], set(root[:-1]), removed_next)
+            if spur is None:
+                continue
+            candidate = root + spur[1:]
+            if tuple(candidate) in seen:
+                continue
+            seen.add(tuple(candidate))
+            candidate_cumulative = cumulative[:i + 1] + [cumulative[i] + cost for cost in spur_cumulative[1:]]
+            heapq.heappush(candidates, (candidate_cumulative[-1], next(tie_breaker), candidate, candidate_cumulative, i))
+        if not candidates:
+            return
+        cost, _, path, cumulative, deviation = heapq.heappop(candidates)
+        found.append((path, cumulative, deviation))
+        yield to_labels(path), cost
+
+
+def main():
+    print("3 cheapest loopless routes A -> G on Weighted Graph:")
+    for rank, (path, cost) in enumerate(k_shortest_paths(graph_weighted, 'A', 'G', k=3), 1):
+        print("\n#{}".format(rank))
+        visualize_path(path, cost)
+    print("\nWith k=0: {} routes".format(len(list(k_shortest_paths(graph_weighted, 'A', 'G', k=0)))))
+
+
+if __name__ == "__main__":
+    main()
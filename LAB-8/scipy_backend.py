@@ -0,0 +1,216 @@
+import os
+import random
+import sys
+import time
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'LAB-5'))
+from csr_graph import CSRGraph
+import L52
+import L81
+from all_pairs import DistanceOracle
+from alt_search import grid_network
+
+try:
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import breadth_first_order, depth_first_order, dijkstra, shortest_path
+    HAVE_SCIPY = True
+except ImportError:
+    HAVE_SCIPY = False
+
+# Predecessor value scipy uses for "no parent"
+NO_PARENT = -9999
+
+
+def to_sparse(graph):
+    """
+    CSRGraph -> scipy csr_matrix, built once per graph. Parallel edges keep their cheapest
+    weight, and 0-weight edges stay as explicit entries, which csgraph treats as edges.
+    """
+    n = graph.num_nodes
+    rows = np.repeat(np.arange(n), np.diff(graph.offsets))
+    cols = graph.targets
+    weights = graph.weights if graph.weighted else np.ones(graph.num_edges)
+    # Group parallel edges, cheapest first; each group stays where its first copy was so
+    # traversals see neighbors in adjacency-list order
+    order = np.lexsort((weights, cols, rows))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = (rows[order][1:] != rows[order][:-1]) | (cols[order][1:] != cols[order][:-1])
+    group_starts = np.flatnonzero(first)
+    positions = np.minimum.reduceat(order, group_starts) if len(order) else order
+    keep = np.argsort(positions, kind='stable')
+    rows, cols = rows[positions[keep]], cols[positions[keep]]
+    weights = weights[order[group_starts]][keep]
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+    return csr_matrix((weights.astype(np.float64), cols, indptr), shape=(n, n))
+
+
+# SciPy csgraph backend
+class ScipyBackend:
+    """
+    Same searches as L81 (and L52's visit order), run in compiled code by scipy.sparse.csgraph.
+    The graph is converted to a CSR matrix once; predecessor arrays are mapped back to labels.
+    """
+
+    def __init__(self, graph):
+        if not HAVE_SCIPY:
+            raise ImportError("ScipyBackend needs SciPy (pip install scipy)")
+        if not isinstance(graph, CSRGraph):
+            graph = CSRGraph.from_adjacency(graph)
+        self.graph = graph
+        self.matrix = to_sparse(graph)
+        self.unweighted = not graph.weighted
+
+    def unroll(self, predecessors, goal_id):
+        path = []
+        node = goal_id
+        while node != NO_PARENT:
+            path.append(int(node))
+            node = predecessors[node]
+        path.reverse()
+        return self.graph.path_labels(path)
+
+    def bfs(self, start, goal):
+        """(path, hop count) like L81's bfs."""
+        start_id, goal_id = self.graph.id_of(start), self.graph.id_of(goal)
+        if start_id is None or goal_id is None:
+            return ([start], 0) if start == goal else (None, None)
+        _, predecessors = breadth_first_order(self.matrix, start_id, return_predecessors=True)
+        if goal_id != start_id and predecessors[goal_id] == NO_PARENT:
+            return None, None
+        path = self.unroll(predecessors, goal_id)
+        return path, len(path) - 1
+
+    def bfs_order(self, start_node, end_node):
+        """Visit order up to end_node like L52's bfs ([] if end_node is never reached)."""
+        return self.visit_order(breadth_first_order, start_node, end_node)
+
+    def dfs_order(self, start_node, end_node):
+        """Visit order up to end_node like L52's dfs ([] if end_node is never reached)."""
+        return self.visit_order(depth_first_order, start_node, end_node)
+
+    def visit_order(self, traversal, start_node, end_node):
+        start_id, end_id = self.graph.id_of(start_node), self.graph.id_of(end_node)
+        if start_id is None:
+            return [start_node] if start_node == end_node else []
+        order = traversal(self.matrix, start_id, return_predecessors=False)
+        found = np.flatnonzero(order == end_id) if end_id is not None else []
+        if not len(found):
+            return []
+        return self.graph.path_labels(order[:found[0] + 1].tolist())
+
+    def uniform_cost_search(self, start, goal, stats=None):
+        """
+        (path, cost) like L81's uniform_cost_search. csgraph has no early stop, so this always
+        solves the whole shortest-path tree from start; stats['reached'] is the number of nodes
+        in that tree, not comparable with the 'settled' count of the Python searches.
+        """
+        start_id, goal_id = self.graph.id_of(start), self.graph.id_of(goal)
+        if start_id is None or goal_id is None:
+            if stats is not None:
+                stats['reached'] = 0
+            return ([start], 0) if start == goal else (None, None)
+        dist, predecessors = dijkstra(self.matrix, indices=start_id, return_predecessors=True)
+        if stats is not None:
+            stats['reached'] = int(np.isfinite(dist).sum())
+        if np.isinf(dist[goal_id]):
+            return None, None
+        return self.unroll(predecessors, goal_id), self.as_cost(dist[goal_id])
+
+    def as_cost(self, cost):
+        # csgraph works in float64; hand back ints when the graph's weights are ints
+        if self.unweighted or np.issubdtype(self.graph.weights.dtype, np.integer):
+            return int(cost)
+        return float(cost)
+
+    def all_pairs(self):
+        """(dist, predecessors) n x n arrays over node ids from csgraph.shortest_path."""
+        return shortest_path(self.matrix, return_predecessors=True)
+
+
+def predecessors_of(next_hop):
+    """
+    DistanceOracle's next_hop table -> the predecessor table csgraph returns: predecessors[i, j]
+    is the node before j on the path i -> j (NO_PARENT on the diagonal and with no path).
+    All pairs walk their paths together, one NumPy step per hop.
+    """
+    n = len(next_hop)
+    rows, cols = np.nonzero(next_hop >= 0)
+    keep = rows != cols
+    rows, cols = rows[keep], cols[keep]
+    before = rows.copy()
+    active = np.arange(len(rows))
+    while len(active):
+        following = next_hop[before[active], cols[active]]
+        moving = following != cols[active]
+        before[active[moving]] = following[moving]
+        active = active[moving]
+    predecessors = np.full((n, n), NO_PARENT, dtype=np.int32)
+    predecessors[rows, cols] = before
+    return predecessors
+
+
+# Pure Python searches behind the same methods, for when SciPy is missing
+class PythonBackend:
+    def __init__(self, graph):
+        self.graph = graph
+        self.csr = None
+
+    def as_csr(self):
+        # L52 and DistanceOracle want plain neighbor lists or a CSRGraph; convert once on first use
+        if self.csr is None:
+            self.csr = self.graph if isinstance(self.graph, CSRGraph) else CSRGraph.from_adjacency(self.graph)
+        return self.csr
+
+    def bfs(self, start, goal):
+        return L81.bfs(self.graph, start, goal)
+
+    def bfs_order(self, start_node, end_node):
+        return L52.bfs(self.as_csr(), start_node, end_node)
+
+    def dfs_order(self, start_node, end_node):
+        return L52.dfs(self.as_csr(), start_node, end_node)
+
+    def uniform_cost_search(self, start, goal, stats=None):
+        return L81.uniform_cost_search(self.graph, start, goal, stats)
+
+    def all_pairs(self):
+        """(dist, predecessors) like ScipyBackend.all_pairs, from a Floyd-Warshall DistanceOracle."""
+        oracle = DistanceOracle.build(self.as_csr())
+        return oracle.dist, predecessors_of(oracle.next_hop)
+
+
+def get_backend(graph, backend='auto'):
+    """
+    backend: 'scipy', 'python', or 'auto' (SciPy when it is installed).
+    Build it once per graph; every query after that reuses the converted matrix.
+    """
+    if backend == 'scipy' or (backend == 'auto' and HAVE_SCIPY):
+        return ScipyBackend(graph)
+    if backend in ('python', 'auto'):
+        return PythonBackend(graph)
+    raise ValueError("unknown backend {!r}".format(backend))
+
+
+def main():
+    backend = get_backend(L81.graph_weighted)
+    print("{} on Weighted Graph:".format(type(backend).__name__))
+    L81.visualize_path(*backend.uniform_cost_search('A', 'G'))
+
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 150
+    graph = CSRGraph.from_adjacency(grid_network(size))
+    rng = random.Random(1)
+    queries = [(rng.choice(graph.labels), rng.choice(graph.labels)) for _ in range(30)]
+    print()
+    results = {}
+    for name in ('python', 'auto'):
+        start_time = time.perf_counter()
+        backend = get_backend(graph, name)
+        results[name] = [backend.uniform_cost_search(start, goal)[1] for start, goal in queries]
+        print("{:<14} {} queries on a {} node grid network: {:.3f} s".format(
+            type(backend).__name__ + ":", len(queries), graph.num_nodes, time.perf_counter() - start_time))
+    assert results['python'] == results['auto']
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+import os
+import random
+import sys
+import time
+from collections import deque
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'LAB-5'))
+from csr_graph import CSRGraph
+from L81 import bfs, graph_unweighted, graph_weighted, uniform_cost_search, visualize_path
+from alt_search import grid_network
+
+MAX_DIAL_WEIGHT = 255
+
+
+def classify_weights(graph, max_dial_weight=MAX_DIAL_WEIGHT):
+    """
+    Look at every edge weight once and name the cheapest algorithm that is still exact:
+    'bfs' (all weights 1), '0-1 bfs' (weights 0 or 1), 'dial' (integers up to max_dial_weight)
+    or 'heap' (anything else).
+    """
+    if isinstance(graph, CSRGraph):
+        if graph.weights is None or graph.num_edges == 0:
+            return 'bfs'
+        weights = graph.weights
+        low, high = weights.min(), weights.max()
+        integral = np.issubdtype(weights.dtype, np.integer) or bool(np.all(weights == np.floor(weights)))
+    else:
+        weights = [weight for neighbors in graph.values() for _, weight in neighbors]
+        if not weights:
+            return 'bfs'
+        low, high = min(weights), max(weights)
+        integral = all(float(weight).is_integer() for weight in weights)
+    if low < 0:
+        raise ValueError("uniform cost search needs non-negative edge weights, found {}".format(low))
+    if low == high == 1:
+        return 'bfs'
+    if integral and high <= 1:
+        return '0-1 bfs'
+    if integral and high <= max_dial_weight:
+        return 'dial'
+    return 'heap'
+
+
+def zero_one_bfs(edges, start, goal, stats):
+    """Deque instead of a heap: 0-cost edges go to the front, 1-cost edges to the back."""
+    queue = deque([(0, start)])
+    cost_so_far = {start: 0}
+    parent = {start: None}
+    while queue:
+        current_cost, current_node = queue.popleft()
+        if current_cost > cost_so_far[current_node]:
+            continue
+        stats['settled'] += 1
+        if current_node == goal:
+            break
+        for neighbor, edge_cost in edges(current_node):
+            new_cost = current_cost + edge_cost
+            if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
+                cost_so_far[neighbor] = new_cost
+                parent[neighbor] = current_node
+                if edge_cost == 0:
+                    queue.appendleft((new_cost, neighbor))
+                else:
+                    queue.append((new_cost, neighbor))
+    return cost_so_far, parent
+
+
+def dial_search(edges, start, goal, max_weight, stats):
+    """
+    Dial's algorithm: a circular array of max_weight + 1 buckets indexed by cost. Every
+    tentative cost is at most max_weight above the bucket being emptied, so the buckets
+    never collide, and push/pop are O(1) instead of O(log n).
+    """
+    num_buckets = int(max_weight) + 1
+    buckets = [[] for _ in range(num_buckets)]
+    buckets[0].append(start)
+    pending = 1
+    cost_so_far = {start: 0}
+    parent = {start: None}
+    current_cost = 0
+    while pending:
+        bucket = buckets[current_cost % num_buckets]
+        while bucket:
+            current_node = bucket.pop()
+            pending -= 1
+            # Stale entry: the node was re-queued at a lower cost and already settled
+            if cost_so_far[current_node] != current_cost:
+                continue
+            stats['settled'] += 1
+            if current_node == goal:
+                return cost_so_far, parent
+            for neighbor, edge_cost in edges(current_node):
+                new_cost = current_cost + edge_cost
+                if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
+                    cost_so_far[neighbor] = new_cost
+                    parent[neighbor] = current_node
+                    buckets[int(new_cost) % num_buckets].append(neighbor)
+                    pending += 1
+        current_cost += 1
+    return cost_so_far, parent
+
+
+# Weight-aware search dispatcher
+class SearchDispatcher:
+    """
+    Classifies the graph's weights once, then answers every query with the matching search.
+    search() returns (path, cost) like uniform_cost_search.
+    """
+
+    def __init__(self, graph, max_dial_weight=MAX_DIAL_WEIGHT):
+        self.graph = graph
+        self.algorithm = classify_weights(graph, max_dial_weight)
+        if self.algorithm == 'dial':
+            if isinstance(graph, CSRGraph):
+                self.max_weight = int(graph.weights.max())
+            else:
+                self.max_weight = int(max(weight for neighbors in graph.values() for _, weight in neighbors))
+
+    def search(self, start, goal, stats=None):
+        counts = stats if stats is not None else {}
+        counts['algorithm'] = self.algorithm
+        if self.algorithm == 'bfs':
+            return bfs(self.graph, start, goal)
+        if self.algorithm == 'heap':
+            return uniform_cost_search(self.graph, start, goal, counts)
+        if start == goal:
+            return [start], 0
+
+        graph = self.graph
+        if isinstance(graph, CSRGraph):
+            source, target = graph.id_of(start), graph.id_of(goal)
+            if source is None or target is None:
+                return None, None
+            edges = graph.edges
+        else:
+            source, target = start, goal
+            edges = lambda node: graph.get(node, [])
+        counts['settled'] = 0
+        if self.algorithm == '0-1 bfs':
+            cost_so_far, parent = zero_one_bfs(edges, source, target, counts)
+        else:
+            cost_so_far, parent = dial_search(edges, source, target, self.max_weight, counts)
+        if target not in parent:
+            return None, None
+        path = []
+        node = target
+        while node is not None:
+            path.append(node)
+            node = parent[node]
+        path.reverse()
+        if isinstance(graph, CSRGraph):
+            path = graph.path_labels(path)
+        return path, cost_so_far[target]
+
+
+def shortest_path(graph, start, goal):
+    """One-off query; build a SearchDispatcher instead when asking many queries on one graph."""
+    return SearchDispatcher(graph).search(start, goal)
+
+
+def main():
+    for name, graph in (("Weighted Graph", graph_weighted), ("Unweighted Graph", graph_unweighted)):
+        dispatcher = SearchDispatcher(graph)
+        print("{} -> {}:".format(name, dispatcher.algorithm))
+        visualize_path(*dispatcher.search('A', 'G'))
+
+    # Small integer travel costs: Dial buckets against the binary heap
+    graph = CSRGraph.from_adjacency(grid_network(150))
+    dispatcher = SearchDispatcher(graph)
+    rng = random.Random(1)
+    queries = [(rng.choice(graph.labels), rng.choice(graph.labels)) for _ in range(30)]
+    print()
+    results = {}
+    for name, search in ((dispatcher.algorithm, dispatcher.search),
+                         ('heap', lambda start, goal: uniform_cost_search(graph, start, goal))):
+        start_time = time.perf_counter()
+        results[name] = [search(start, goal)[1] for start, goal in queries]
+        print("{:>5} on a {} node grid network: {:.3f} s".format(
+            name, graph.num_nodes, time.perf_counter() - start_time))
+    assert results[dispatcher.algorithm] == results['heap']
+
+
+if __name__ == "__main__":
+    main()
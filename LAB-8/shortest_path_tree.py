@@ -0,0 +1,129 @@
+import heapq
+import os
+import sys
+from collections import OrderedDict
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'LAB-5'))
+from csr_graph import CSRGraph
+from L81 import graph_weighted, uniform_cost_search, visualize_path
+
+
+# Shortest-path tree that grows only as far as the goals asked so far
+class ShortestPathTree:
+    """
+    Uniform cost search from one source that pauses as soon as the requested goal
+    is settled. The heap, cost_so_far and parent are kept, so a later goal either
+    is already settled (answered straight from the tree) or resumes the search.
+    """
+
+    def __init__(self, edges, source):
+        self.edges = edges
+        self.source = source
+        self.priority_queue = [(0, source)]
+        self.cost_so_far = {source: 0}
+        self.parent = {source: None}
+        self.settled = set()
+
+    @property
+    def complete(self):
+        return not self.priority_queue
+
+    def settle(self, goal=None):
+        """Run until goal is settled (or the whole tree when goal is None). True if goal is reachable."""
+        priority_queue, cost_so_far, parent, settled = self.priority_queue, self.cost_so_far, self.parent, self.settled
+        while priority_queue and goal not in settled:
+            current_cost, current_node = heapq.heappop(priority_queue)
+            if current_node in settled or current_cost > cost_so_far[current_node]:
+                continue
+            settled.add(current_node)
+            for neighbor, edge_cost in self.edges(current_node):
+                new_cost = current_cost + edge_cost
+                if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
+                    cost_so_far[neighbor] = new_cost
+                    parent[neighbor] = current_node
+                    heapq.heappush(priority_queue, (new_cost, neighbor))
+        return goal in settled
+
+    def path_to(self, goal):
+        """(path, cost) to goal like uniform_cost_search, or (None, None) if unreachable."""
+        if not self.settle(goal):
+            return None, None
+        path = []
+        node = goal
+        while node is not None:
+            path.append(node)
+            node = self.parent[node]
+        path.reverse()
+        return path, self.cost_so_far[goal]
+
+
+# Bounded LRU of shortest-path trees keyed by source
+class ShortestPathTreeCache:
+    """
+    Parameters:
+    - graph: adjacency dict {node: [(neighbor, weight), ...]} or CSRGraph
+    - maxsize: number of source trees kept; the least recently used one is dropped first
+    """
+
+    def __init__(self, graph, maxsize=16):
+        self.graph = graph
+        self.maxsize = maxsize
+        self.trees = OrderedDict()
+        self.stats = {'trees_built': 0, 'answered_from_tree': 0, 'resumed': 0, 'evicted': 0}
+        if isinstance(graph, CSRGraph):
+            self.edges = graph.edges
+        else:
+            self.edges = lambda node: graph.get(node, [])
+
+    def tree(self, source):
+        """The (possibly partial) shortest-path tree for source, built on first use."""
+        tree = self.trees.get(source)
+        if tree is None:
+            root = self.graph.id_of(source) if isinstance(self.graph, CSRGraph) else source
+            tree = self.trees[source] = ShortestPathTree(self.edges, root)
+            self.stats['trees_built'] += 1
+            if len(self.trees) > self.maxsize:
+                self.trees.popitem(last=False)
+                self.stats['evicted'] += 1
+        else:
+            self.trees.move_to_end(source)
+        return tree
+
+    def query(self, start, goal):
+        """Same result as uniform_cost_search(graph, start, goal)."""
+        if start == goal:
+            return [start], 0
+        if isinstance(self.graph, CSRGraph):
+            if self.graph.id_of(start) is None or self.graph.id_of(goal) is None:
+                return None, None
+            tree = self.tree(start)
+            self.count_query(tree, self.graph.id_of(goal))
+            path, cost = tree.path_to(self.graph.id_of(goal))
+            return (None, None) if path is None else (self.graph.path_labels(path), cost)
+        tree = self.tree(start)
+        self.count_query(tree, goal)
+        return tree.path_to(goal)
+
+    def query_many(self, start, goals):
+        """{goal: (path, cost)} for every goal, all answered from one tree."""
+        return {goal: self.query(start, goal) for goal in goals}
+
+    def count_query(self, tree, goal):
+        if goal in tree.settled or tree.complete:
+            self.stats['answered_from_tree'] += 1
+        elif tree.settled:
+            self.stats['resumed'] += 1
+
+
+def main():
+    cache = ShortestPathTreeCache(graph_weighted, maxsize=4)
+    depot = 'A'
+    for goal in ['D', 'B', 'G', 'F', 'C']:
+        path, cost = cache.query(depot, goal)
+        assert (path, cost) == uniform_cost_search(graph_weighted, depot, goal)
+        print("{} -> {}:".format(depot, goal))
+        visualize_path(path, cost)
+    print("\nCache stats:", cache.stats)
+
+
+if __name__ == "__main__":
+    main()